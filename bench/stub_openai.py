@@ -0,0 +1,180 @@
+"""Local OpenAI-compatible server that replays canned completions for offline benchmarks.
+
+It understands just enough of ``/v1/chat/completions`` for both backends: when the request offers a
+search, read-website or agno ``transfer_task_to_*`` tool that has not been used yet it answers with a
+tool call, otherwise it returns the fixture's research notes (searcher) or script (writer/editor).
+It also mimics OpenAI's automatic prompt caching (prefixes of 1024+ tokens, in 128-token steps) so
+``cached_tokens`` shows whether the prompt builders keep their prefixes stable.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from onepiece_core.extract import estimate_tokens
+
+
+# Character counts matching estimate_tokens' 4 characters per token.
+MIN_CACHED_CHARS = 1024 * 4
+CACHE_BLOCK_CHARS = 128 * 4
+
+
+class Replay:
+    def __init__(self, fixture, latency=0.0):
+        self.fixture = fixture
+        self.latency = latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self._prefixes = set()
+        self._lock = threading.Lock()
+
+    def reset(self, fixture=None):
+        with self._lock:
+            if fixture is not None:
+                self.fixture = fixture
+            snapshot = {
+                "llm_calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+            self.calls = self.prompt_tokens = self.cached_tokens = self.completion_tokens = 0
+        return snapshot
+
+    def _cached_chars(self, prompt):
+        digest = hashlib.sha256()
+        cached = 0
+        boundaries = []
+        for end in range(CACHE_BLOCK_CHARS, len(prompt) + 1, CACHE_BLOCK_CHARS):
+            digest.update(prompt[end - CACHE_BLOCK_CHARS:end].encode("utf-8"))
+            boundaries.append(digest.hexdigest())
+            if end >= MIN_CACHED_CHARS and boundaries[-1] in self._prefixes:
+                cached = end
+        with self._lock:
+            self._prefixes.update(boundaries)
+        return cached
+
+    def _tool_call(self, tool, value):
+        properties = tool.get("parameters", {}).get("properties", {})
+        arguments = {}
+        for name, schema in properties.items():
+            if schema.get("type") == "integer":
+                arguments[name] = 10
+            elif schema.get("type", "string") == "string":
+                arguments[name] = value
+        return {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                "function": {"name": tool["name"], "arguments": json.dumps(arguments)}}
+
+    def respond(self, body):
+        messages = body.get("messages", [])
+        tools = [t["function"] for t in body.get("tools") or [] if t.get("type") == "function"]
+        used = sum(1 for message in messages if message.get("role") == "tool")
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        fixture = self.fixture
+
+        transfers = sorted((t for t in tools if t["name"].startswith("transfer_task_to_")), key=lambda t: "writer" in t["name"])
+        if transfers:
+            if used < len(transfers):
+                return None, [self._tool_call(transfers[used], f"{fixture['topic']}: {fixture['url']}")]
+            return fixture["script"], None
+
+        search = next((t for t in tools if "search" in t["name"].lower()), None)
+        read = next((t for t in tools if any(word in t["name"].lower() for word in ("read", "website", "scrape"))), None)
+        if used == 0 and search is not None:
+            return None, [self._tool_call(search, fixture["query"])]
+        if used == 0 and read is not None and "do not read the page again" not in prompt:
+            return None, [self._tool_call(read, fixture["url"])]
+        text = fixture["research"] if search is not None or "researcher" in prompt.lower()[:2000] else fixture["script"]
+        if not tools and "Final Answer:" in prompt:
+            # crewai's text (ReAct) protocol, used when the model is not given native tools.
+            text = f"Thought: I now know the final answer\nFinal Answer: {text}"
+        return text, None
+
+    def complete(self, body):
+        if self.latency:
+            time.sleep(self.latency)
+        content, tool_calls = self.respond(body)
+        prompt = json.dumps(body.get("tools") or []) + json.dumps(body.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt)
+        cached_tokens = self._cached_chars(prompt) // 4
+        completion_tokens = estimate_tokens(content or json.dumps(tool_calls))
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.completion_tokens += completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens,
+                 "prompt_tokens_details": {"cached_tokens": cached_tokens}}
+        return content, tool_calls, usage
+
+
+def _handler(replay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, content_type="application/json"):
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"unsupported path {self.path}"}})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            content, tool_calls, usage = replay.complete(body)
+            model = body.get("model", "stub")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            finish_reason = "tool_calls" if tool_calls else "stop"
+            if not body.get("stream"):
+                message = {"role": "assistant", "content": content}
+                if tool_calls:
+                    message["tool_calls"] = tool_calls
+                self._send(200, {
+                    "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                    "usage": usage,
+                })
+                return
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            delta = {"role": "assistant", "content": content}
+            if tool_calls:
+                delta["tool_calls"] = [dict(call, index=index) for index, call in enumerate(tool_calls)]
+            events = [
+                dict(chunk, choices=[{"index": 0, "delta": delta, "finish_reason": None}]),
+                dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": finish_reason}]),
+                dict(chunk, choices=[], usage=usage),
+            ]
+            stream = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+            self._send(200, stream.encode("utf-8"), "text/event-stream")
+
+    return Handler
+
+
+class StubOpenAIServer:
+    """Serves ``replay`` on 127.0.0.1 in a background thread; ``base_url`` ends in ``/v1``."""
+
+    def __init__(self, replay, port=0):
+        self.replay = replay
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _handler(replay))
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,188 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from onepiece_core import ratelimit, tracing
+from onepiece_core.backends import BACKENDS, LLM_STAGES, ScriptResult, create_stages, load_backend
+from onepiece_core.pipeline import AsyncPipeline, Stage
+from onepiece_core.voiceover import MAX_SECONDS, MIN_SECONDS, caption_name, fit_script, write_captions
+
+
+def read_topics(path):
+    topics = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            topic = line.strip()
+            if topic and not topic.startswith("#") and topic not in topics:
+                topics.append(topic)
+    return topics
+
+
+def completed_topics(path):
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write leaves at most one truncated trailing line.
+                continue
+            if record.get("status") in ("ok", "duplicate"):
+                done.add(record["topic"])
+    return done
+
+
+class ResultWriter:
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def batch_record(result, seconds):
+    record = {"topic": result.request, **result.to_dict()}
+    del record["request"]
+    record.update(seconds=round(seconds, 2), finished_at=time.time())
+    return record
+
+
+def run_threaded(backend, args, openai_api_key, search_api_key, llm_calls, topics, report):
+    # Agents keep per-run state, so every worker thread builds its own set.
+    local = threading.local()
+
+    def generate(topic):
+        if not hasattr(local, "agents"):
+            local.agents = backend.create_agents(openai_api_key, search_api_key)
+        # The frameworks make their own LLM requests, so the OpenAI budget is charged per script.
+        ratelimit.acquire("openai", llm_calls)
+        started = time.perf_counter()
+        result = ScriptResult(request=topic, backend=args.backend)
+        run_span = tracing.start_span("pipeline", request=topic, backend=args.backend, mode="batch")
+        token = tracing.activate(run_span)
+        try:
+            result.script, timing = fit_script(backend.run_pipeline(local.agents, topic))
+            result.voiceover = timing.to_dict()
+            result.url = backend.research_url(local.agents)
+            result.save()
+        except Exception as e:
+            result.status, result.error = "error", f"{type(e).__name__}: {e}"
+            run_span.error = result.error
+        finally:
+            tracing.deactivate(token)
+            tracing.end_span(run_span)
+        result.trace_id = run_span.trace_id
+        return batch_record(result, seconds=time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(generate, topic) for topic in topics]
+        for count, future in enumerate(as_completed(futures), 1):
+            report(count, future.result())
+
+
+def run_pipelined(backend, args, openai_api_key, search_api_key, llm_calls, topics, report):
+    stages = create_stages(args.backend, openai_api_key, search_api_key, workers=args.workers, variants=args.variants)
+    calls_per_stage = max(1, llm_calls // len(LLM_STAGES))
+
+    def metered(make_fn, calls):
+        def make():
+            fn = make_fn()
+
+            def run(state):
+                ratelimit.acquire("openai", calls)
+                return fn(state)
+
+            return run
+
+        return make
+
+    # Only stages that call the model are charged, and the writer makes one request per draft.
+    stages = [
+        Stage(stage.name, metered(stage.make_fn, calls_per_stage * (args.variants if stage.name == "write" else 1)), stage.workers)
+        if stage.name in LLM_STAGES else stage
+        for stage in stages
+    ]
+    count = 0
+
+    def on_result(job):
+        nonlocal count
+        count += 1
+        result = ScriptResult.from_job(job, args.backend).save(job.state.get("facts"))
+        report(count, batch_record(result, seconds=sum(job.timings.values())))
+
+    pipeline = AsyncPipeline(stages, queue_size=args.workers, trace_attributes={"backend": args.backend, "mode": "pipelined"})
+    asyncio.run(pipeline.run(topics, on_result=on_result))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate One Piece shorts scripts for a list of topics.")
+    parser.add_argument("topics", help="text file with one character or topic per line")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="agno")
+    parser.add_argument("--out", default="results.jsonl", help="JSONL output; existing successes are skipped")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent pipelines (per stage with --pipelined)")
+    parser.add_argument("--pipelined", action="store_true", help="run searcher, writer and editor as overlapping stages")
+    parser.add_argument("--variants", type=int, default=1, help="with --pipelined, drafts per topic; the best-ranked one is kept")
+    parser.add_argument("--captions", metavar="DIR", help="write SRT and SSML voiceover files for every saved script into DIR")
+    parser.add_argument("--openai-rpm", type=int, default=60, help="OpenAI requests per minute (0 = unlimited)")
+    parser.add_argument("--search-rpm", type=int, default=30, help="search API requests per minute (0 = unlimited)")
+    parser.add_argument("--fetch-rpm", type=int, default=60, help="wiki page fetches per minute (0 = unlimited)")
+    args = parser.parse_args(argv)
+
+    info = BACKENDS[args.backend]
+    search_key_env, search_provider, llm_calls = info.search_key_env, info.search_provider, info.llm_calls
+    openai_api_key = os.environ.get("OPENAI_API_KEY")
+    search_api_key = os.environ.get(search_key_env)
+    if not openai_api_key or not search_api_key:
+        parser.error(f"set OPENAI_API_KEY and {search_key_env} in the environment")
+
+    ratelimit.set_rate_limit("openai", args.openai_rpm, burst=llm_calls * args.workers)
+    ratelimit.set_rate_limit(search_provider, args.search_rpm)
+    ratelimit.set_rate_limit("onepiece.fandom.com", args.fetch_rpm)
+
+    backend = load_backend(args.backend)
+    done = completed_topics(args.out)
+    pending = [topic for topic in read_topics(args.topics) if topic not in done]
+    print(f"{len(done)} topics already done, {len(pending)} to generate with {args.backend}", file=sys.stderr)
+
+    writer = ResultWriter(args.out)
+    failures = 0
+
+    def report(count, record):
+        nonlocal failures
+        writer.write(record)
+        failures += record["status"] == "error"
+        timing = record.get("voiceover") or {}
+        read = f", reads in {timing['seconds']}s" if timing else ""
+        if timing and timing["status"] != "ok":
+            read += f" (outside {MIN_SECONDS}-{MAX_SECONDS}s)"
+        print(f"[{count}/{len(pending)}] {record['status']} {record['topic']} ({record['seconds']}s{read})", file=sys.stderr)
+        if args.captions and record["status"] == "ok":
+            # The script was already fitted by the voiceover stage, so it is only timed here.
+            write_captions(args.captions, caption_name(record.get("number"), record["topic"]), record["script"], fit=False)
+
+    try:
+        if args.pipelined:
+            run_pipelined(backend, args, openai_api_key, search_api_key, llm_calls, pending, report)
+        else:
+            run_threaded(backend, args, openai_api_key, search_api_key, llm_calls, pending, report)
+    finally:
+        writer.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
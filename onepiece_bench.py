@@ -0,0 +1,184 @@
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench.stub_openai import Replay, StubOpenAIServer
+from onepiece_core.backends import BACKENDS, create_stages, load_backend
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "fixtures")
+MODES = ("delegation", "direct")
+
+
+def load_fixtures(path=FIXTURES):
+    with open(os.path.join(path, "topics.json"), encoding="utf-8") as f:
+        fixtures = json.load(f)
+    for fixture in fixtures:
+        with open(os.path.join(path, fixture["page"]), encoding="utf-8") as f:
+            fixture["html"] = f.read()
+    return fixtures
+
+
+def seed_cache(fixtures):
+    # Recorded search results and pages are served from the content cache, so the tools run their
+    # normal lookup, decompression and fact-sheet extraction without touching the network.
+    from onepiece_core.cache import get_cache
+
+    cache = get_cache()
+    cache.clear()
+    for fixture in fixtures:
+        results = json.dumps(fixture["results"], ensure_ascii=False)
+        for source in {backend.search_provider for backend in BACKENDS.values()}:
+            cache.put(source, f"{fixture['query']} num=10", results)
+        cache.put("page", fixture["url"], fixture["html"])
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def make_runner(name, mode, variants=1):
+    if mode == "delegation":
+        from onepiece_core import tracing
+
+        backend = load_backend(name)
+        agents = backend.create_agents("sk-bench", "bench-search-key")
+
+        def run_delegation(topic):
+            with tracing.span("pipeline", request=topic, backend=name, mode="delegation"):
+                return backend.run_pipeline(agents, topic)
+
+        return run_delegation
+
+    from onepiece_core.pipeline import run_stages
+
+    # Every round repeats the same topics, so memoized stage outputs would skip the LLM calls.
+    stage_fns = [(stage.name, stage.make_fn()) for stage in create_stages(name, "sk-bench", "bench-search-key", variants=variants, memo=False)]
+
+    def run(topic):
+        job = run_stages(stage_fns, topic)
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        return job.state["script"]
+
+    return run
+
+
+def bench(name, mode, fixtures, replay, iterations, variants=1):
+    run = make_runner(name, mode, variants)
+    samples = []
+    for iteration in range(iterations + 1):
+        for fixture in fixtures:
+            replay.reset(fixture)
+            # The first round is a warm-up (imports, client setup) and also measures peak memory;
+            # tracemalloc slows allocation-heavy code, so later rounds run without it.
+            traced = iteration == 0
+            if traced:
+                gc.collect()
+                tracemalloc.start()
+            started = time.perf_counter()
+            error = None
+            try:
+                run(fixture["topic"])
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            seconds = time.perf_counter() - started
+            usage = replay.reset()
+            if traced:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                samples.append({"warmup": True, "topic": fixture["topic"], "peak_mib": peak / 1024 / 1024, "error": error, **usage})
+            else:
+                samples.append({"warmup": False, "topic": fixture["topic"], "seconds": seconds, "error": error, **usage})
+    return summarize(name, mode, samples)
+
+
+def summarize(name, mode, samples):
+    timed = [sample for sample in samples if not sample["warmup"]]
+    ok = [sample for sample in timed if sample["error"] is None]
+    errors = sorted({sample["error"] for sample in samples if sample["error"] is not None})
+    seconds = [sample["seconds"] for sample in ok]
+    return {
+        "backend": name,
+        "mode": mode,
+        "scripts": len(timed),
+        "errors": len(timed) - len(ok),
+        "p50_s": round(percentile(seconds, 50), 3) if seconds else None,
+        "p90_s": round(percentile(seconds, 90), 3) if seconds else None,
+        "p99_s": round(percentile(seconds, 99), 3) if seconds else None,
+        "llm_calls": round(statistics.mean(sample["llm_calls"] for sample in ok), 1) if ok else None,
+        "prompt_tokens": round(statistics.mean(sample["prompt_tokens"] for sample in ok)) if ok else None,
+        "cached_tokens": round(statistics.mean(sample["cached_tokens"] for sample in ok)) if ok else None,
+        "peak_mib": round(max(sample["peak_mib"] for sample in samples if sample["warmup"]), 1),
+        "error_messages": errors,
+    }
+
+
+def print_table(rows):
+    columns = ["backend", "mode", "scripts", "errors", "p50_s", "p90_s", "p99_s", "llm_calls", "prompt_tokens", "cached_tokens", "peak_mib"]
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+    for row in rows:
+        for message in row["error_messages"]:
+            print(f"{row['backend']}/{row['mode']}: {message}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark both pipelines offline against recorded fixtures.")
+    parser.add_argument("--backend", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--iterations", type=int, default=5, help="timed rounds over all fixture topics")
+    parser.add_argument("--variants", type=int, default=1, help="parallel writer drafts per topic in direct mode")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the stub waits per completion")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures()
+    workdir = tempfile.mkdtemp(prefix="onepiece-bench-")
+    # Everything the pipelines read from the environment has to point at local state before the
+    # backends are imported and the cache singleton is created.
+    os.environ.update(
+        ONEPIECE_CACHE_DIR=workdir,
+        ONEPIECE_TRACE_FILE=os.path.join(workdir, "traces.jsonl"),
+        ONEPIECE_WIKI_INDEX=os.path.join(workdir, "wiki_index.sqlite"),
+        ONEPIECE_HISTORY_DB=os.path.join(workdir, "history.sqlite"),
+        OPENAI_API_KEY="sk-bench",
+        CREWAI_DISABLE_TELEMETRY="true",
+        OTEL_SDK_DISABLED="true",
+    )
+    seed_cache(fixtures)
+
+    rows = []
+    with StubOpenAIServer(Replay(fixtures[0], args.llm_latency)) as server:
+        os.environ.update(OPENAI_BASE_URL=server.base_url, OPENAI_API_BASE=server.base_url)
+        for name in args.backend:
+            for mode in args.mode:
+                print(f"benchmarking {name}/{mode}...", file=sys.stderr)
+                try:
+                    rows.append(bench(name, mode, fixtures, server.replay, args.iterations, args.variants))
+                except ImportError as e:
+                    print(f"skipping {name}: {e}", file=sys.stderr)
+                    break
+    if not rows:
+        return 1
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
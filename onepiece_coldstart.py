@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+
+BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "coldstart_budget.json")
+# Headroom --update leaves over the measured import time; cold imports vary a lot between machines.
+UPDATE_HEADROOM = 1.5
+
+
+def import_times(statement):
+    """Self time in microseconds of every module ``statement`` imports in a fresh interpreter, from
+    ``python -X importtime``. Modules the bare interpreter loads on startup are dropped."""
+    def run(code):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        if result.returncode != 0:
+            raise ImportError(result.stderr.strip().splitlines()[-1])
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                times[name.strip()] = int(self_us)
+        return times
+
+    startup = run("pass")
+    return {name: us for name, us in run(statement).items() if name not in startup}
+
+
+def measure(module, runs):
+    # Best of several runs: the minimum is the least disturbed by whatever else the machine is doing.
+    samples = [import_times(f"import {module}") for _ in range(runs)]
+    times = min(samples, key=lambda sample: sum(sample.values()))
+    packages = Counter()
+    for name, us in times.items():
+        packages[name.split(".")[0]] += us
+    return {
+        "module": module,
+        "ms": round(sum(times.values()) / 1000, 1),
+        "modules": len(times),
+        "packages": {name: round(us / 1000, 1) for name, us in packages.most_common()},
+    }
+
+
+def check(result, budget):
+    """Budget violations for one measured module: over ``max_ms``, or a ``forbidden`` package loaded."""
+    problems = []
+    if result["ms"] > budget["max_ms"]:
+        problems.append(f"{result['ms']} ms over the {budget['max_ms']} ms budget")
+    loaded = sorted(set(budget.get("forbidden", [])) & set(result["packages"]))
+    if loaded:
+        problems.append(f"imports {', '.join(loaded)} at module load")
+    return problems
+
+
+def print_report(result, problems, top):
+    status = "FAIL" if problems else "ok"
+    print(f"{result['module']}: {result['ms']} ms, {result['modules']} modules [{status}]")
+    for name, ms in list(result["packages"].items())[:top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+    for problem in problems:
+        print(f"  ! {problem}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time against the budget file.")
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: every module in the budget)")
+    parser.add_argument("--budget", default=BUDGET)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the fastest counts")
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages to list per module")
+    parser.add_argument("--update", action="store_true", help=f"rewrite max_ms to {UPDATE_HEADROOM}x the measured time")
+    parser.add_argument("--json", help="also write the measurements to this file")
+    parser.add_argument("--allow-missing", action="store_true", help="skip modules that fail to import instead of failing")
+    args = parser.parse_args(argv)
+
+    with open(args.budget, encoding="utf-8") as f:
+        budgets = json.load(f)
+    failed = False
+    missing = []
+    results = []
+    for module in args.modules or list(budgets):
+        try:
+            result = measure(module, args.runs)
+        except ImportError as e:
+            print(f"{module}: {'skipped' if args.allow_missing else 'FAIL'} ({e})", file=sys.stderr)
+            missing.append(module)
+            continue
+        budget = budgets.setdefault(module, {"max_ms": 0, "forbidden": []})
+        if args.update:
+            budget["max_ms"] = round(result["ms"] * UPDATE_HEADROOM)
+        problems = check(result, budget)
+        failed = failed or bool(problems)
+        print_report(result, problems, args.top)
+        results.append({**result, "problems": problems})
+
+    if args.update:
+        with open(args.budget, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, indent=2)
+            f.write("\n")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed or (missing and not args.allow_missing) or not results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
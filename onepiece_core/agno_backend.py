@@ -0,0 +1,202 @@
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from agno.run.response import RunEvent
+
+from onepiece_core import prompts, scheduler, tools, tracing
+from onepiece_core.backends import BACKENDS
+from onepiece_core.routing import ModelRouter, load_router
+from onepiece_core.streaming import StreamEvent
+from onepiece_core.validate import repair_prompt
+
+
+MODEL_ID = BACKENDS["agno"].model_id
+
+
+def chat_model(model_id, openai_api_key, cache_key):
+    # Agent system prompts carry no per-request data (no timestamps), so they form a byte-identical
+    # prefix that OpenAI caches automatically; a per-role prompt_cache_key keeps requests sharing a
+    # prefix on the same cache.
+    return OpenAIChat(id=model_id, api_key=openai_api_key, request_params={"prompt_cache_key": f"onepiece-{cache_key}"})
+
+
+def create_agents(openai_api_key, serp_api_key, model_id=MODEL_ID, router=None):
+    # The team has no per-stage validation or escalation, so every member stays on the backend model
+    # unless a "lead" route is configured; the direct stages pass a router pinned to their routed model.
+    router = router or load_router(model_id)
+
+    def search_wiki(query: str, num_results: int = 10) -> str:
+        """Search One Piece Wiki character pages and return the top results (title, link, snippet) as JSON.
+        Results from the local wiki index also include height_cm, devil_fruit, inlinks (popularity)
+        and a 0-1 surprise score. Falls back to Google when there is no local match.
+
+        Args:
+            query (str): The search query, e.g. 'site:onepiece.fandom.com Sanjuan Wolf'.
+            num_results (int): Maximum number of results to return.
+        """
+        return tools.wiki_search(query, num_results, lambda q, n: tools.serpapi_search(q, serp_api_key, n))
+
+    topic_searcher = Agent(
+        name=prompts.SEARCHER.name,
+        role=prompts.SEARCHER.goal,
+        model=chat_model(router.model("lead"), openai_api_key, "searcher"),
+        description=prompts.SEARCHER.backstory,
+        instructions=prompts.SEARCHER_INSTRUCTIONS,
+        tools=[search_wiki],
+    )
+
+    script_writer = Agent(
+        name=prompts.WRITER.name,
+        role=prompts.WRITER.goal,
+        model=chat_model(router.model("lead"), openai_api_key, "writer"),
+        description=prompts.WRITER.backstory,
+        instructions=prompts.WRITER_INSTRUCTIONS,
+        tools=[tools.read_website],
+        markdown=True,
+    )
+
+    editor = Agent(
+        name=prompts.EDITOR.name,
+        role=prompts.EDITOR.goal,
+        model=chat_model(router.model("lead"), openai_api_key, "team-editor"),
+        team=[topic_searcher, script_writer],
+        description=prompts.EDITOR.backstory,
+        instructions=prompts.TEAM_EDITOR_INSTRUCTIONS,
+        markdown=True,
+    )
+
+    return topic_searcher, script_writer, editor
+
+
+def build_query(user_request=""):
+    return prompts.research_query(user_request, tools.covered_topics_hint())
+
+
+def research_url(agents):
+    """Wiki URL the topic searcher picked in the last team run."""
+    response = agents[0].run_response
+    return tools.find_wiki_url(response.content) if response is not None and response.content else None
+
+
+def run_pipeline(agents, user_request=""):
+    topic_searcher, script_writer, editor = agents
+    content = editor.run(build_query(user_request), stream=False).content
+    trace_team_run(agents)
+    return content
+
+
+def stream_pipeline(agents, user_request=""):
+    topic_searcher, script_writer, editor = agents
+    yield StreamEvent("stage", editor.name)
+    for event in editor.run(build_query(user_request), stream=True, stream_intermediate_steps=True):
+        if event.event == RunEvent.tool_call_started and event.tool is not None:
+            if event.tool.tool_name.startswith("transfer_task_to_"):
+                # Team delegation: a member agent takes over until the transfer call completes.
+                member = event.tool.tool_name[len("transfer_task_to_"):]
+                yield StreamEvent("stage", member)
+                yield StreamEvent("tool", f"Task: {(event.tool.tool_args or {}).get('task_description', '')}")
+            else:
+                yield StreamEvent("tool", f"{event.tool.tool_name}({event.tool.tool_args or {}})")
+        elif event.event == RunEvent.tool_call_completed and event.tool is not None:
+            if event.tool.tool_name.startswith("transfer_task_to_"):
+                yield StreamEvent("stage", editor.name)
+        elif event.event == RunEvent.run_response_content and event.content:
+            yield StreamEvent("token", event.content)
+    trace_team_run(agents)
+    yield StreamEvent("result", editor.run_response.content)
+
+
+def create_stage_editor(openai_api_key, model_id=MODEL_ID):
+    # Stand-alone editor for staged runs: same brief as the team editor, minus the delegation steps.
+    return Agent(
+        name=prompts.EDITOR.name,
+        role=prompts.EDITOR.goal,
+        model=chat_model(model_id, openai_api_key, "stage-editor"),
+        description=prompts.EDITOR.backstory,
+        instructions=prompts.STAGE_EDITOR_INSTRUCTIONS,
+        markdown=True,
+    )
+
+
+def create_repair_editor(openai_api_key, model_id=MODEL_ID):
+    # Fixes only the lines the validator flagged; the rules travel with each prompt, so the
+    # instructions stay short.
+    return Agent(
+        name=prompts.REPAIRER.name,
+        role=prompts.REPAIRER.goal,
+        model=chat_model(model_id, openai_api_key, "repairer"),
+        instructions=prompts.REPAIRER_INSTRUCTIONS,
+    )
+
+
+def run_usage(response):
+    metrics = (response.metrics if response is not None else None) or {}
+    return {
+        "llm_calls": len(metrics.get("input_tokens", [])),
+        "input_tokens": sum(metrics.get("input_tokens", [])),
+        "cached_tokens": sum(metrics.get("cached_tokens", [])),
+        "output_tokens": sum(metrics.get("output_tokens", [])),
+    }
+
+
+def trace_llm_calls(response, agent_name):
+    # agno reports per-message metrics only once the run is over, so LLM spans are recorded
+    # after the fact under the current stage or pipeline span.
+    messages = (response.messages if response is not None else None) or []
+    system_prompt = next((message.content for message in messages if message.role == "system"), "")
+    for message in messages:
+        if message.role != "assistant" or message.metrics is None or message.from_history:
+            continue
+        tracing.record_llm_call(
+            response.model,
+            message.metrics.time or 0.0,
+            message.metrics.input_tokens,
+            message.metrics.output_tokens,
+            agent=agent_name,
+            cached_tokens=message.metrics.cached_tokens,
+            prefix_sha=tracing.prefix_digest(system_prompt),
+        )
+
+
+def trace_team_run(agents):
+    for agent in agents:
+        trace_llm_calls(agent.run_response, agent.name)
+
+
+def delegation_breakdown(agents, seconds):
+    # Model time per agent comes from its message metrics; the editor row is the coordinator.
+    rows = []
+    for agent in (agents[2], agents[0], agents[1]):
+        metrics = (agent.run_response.metrics if agent.run_response is not None else None) or {}
+        rows.append({"stage": agent.name, "seconds": round(sum(metrics.get("time", [])), 2), **run_usage(agent.run_response)})
+    rows.append({"stage": "total (wall)", "seconds": round(seconds, 2), **{
+        key: sum(row[key] for row in rows) for key in ("llm_calls", "input_tokens", "cached_tokens", "output_tokens")
+    }})
+    return rows
+
+
+def create_stage_agents(openai_api_key, serp_api_key, model_id=MODEL_ID):
+    """Searcher, writer, stage editor and repairer all on ``model_id``, for one routed model."""
+    topic_searcher, script_writer, _ = create_agents(openai_api_key, serp_api_key, model_id, ModelRouter(model_id, {}))
+    return topic_searcher, script_writer, create_stage_editor(openai_api_key, model_id), create_repair_editor(openai_api_key, model_id)
+
+
+# Agent (index into ``create_stage_agents``) and prompt for each role of the direct pipeline.
+ROLE_PROMPTS = {
+    "search": (0, lambda inputs: build_query(inputs["request"])),
+    "write": (1, lambda inputs: prompts.writing_request(inputs["url"], inputs["facts"], inputs["angle"])),
+    "edit": (2, lambda inputs: prompts.editing_request(inputs["draft"], inputs["facts"])),
+    "repair": (3, lambda inputs: repair_prompt(inputs["draft"], inputs["report"])),
+}
+
+
+def run_stage_agent(stage_agents, role, model, slot=0, **inputs):
+    """Run ``role``'s agent on ``model`` for ``backends.build_stage_fns`` and return ``(text, usage)``."""
+    index, make_prompt = ROLE_PROMPTS[role]
+    agent = stage_agents(model, slot)[index]
+    prompt = make_prompt(inputs)
+    ticket = scheduler.llm_turn(prompt)
+    response = agent.run(prompt, stream=False)
+    usage = run_usage(response)
+    ticket.settle(usage)
+    trace_llm_calls(response, agent.name)
+    return response.content, usage
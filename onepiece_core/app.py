@@ -0,0 +1,296 @@
+import secrets
+import time
+
+import streamlit as st
+
+from onepiece_core import prompts, scheduler, tracing
+from onepiece_core.backends import BACKENDS, STAGE_NAMES, build_stage_fns, load_backend
+from onepiece_core.cache import get_cache
+from onepiece_core.extract import extraction_reports
+from onepiece_core.grounding import check_script
+from onepiece_core.jobs import get_jobs
+from onepiece_core.memo import memoize_stages
+from onepiece_core.pipeline import PipelineJob, run_stages
+from onepiece_core.routing import load_router
+from onepiece_core.voiceover import fit_script
+from onepiece_core.ui import record_time_to_first_token, render_budgets, render_history, render_job_result, render_jobs, render_recent_runs, render_stream, render_streaming_metrics, render_trimmed, render_violations, render_voiceover, save_script
+
+
+DIRECT_PIPELINE = "Direct pipeline"
+# Agents are cached per browser session, so the caches are bounded: a set is rebuilt an hour after
+# it was built, and past ``max_entries`` the least recently used sets are dropped first.
+AGENT_TTL = 3600
+
+
+@st.cache_resource(show_spinner=False, ttl=AGENT_TTL, max_entries=32)
+def load_agents(backend_name, session):
+    # Cached per (backend, session) so reruns reuse the agents and their HTTP clients, and two
+    # sessions never run the same agent at once. The first call also imports the framework, which
+    # is why it only happens once Generate is pressed.
+    build_started = time.perf_counter()
+    agents = load_backend(backend_name).create_agents(session.openai_api_key, session.search_api_key)
+    return agents, time.perf_counter() - build_started
+
+
+@st.cache_resource(show_spinner=False, ttl=AGENT_TTL, max_entries=128)
+def load_stage_agents(backend_name, session, model_id, slot=0):
+    # One set per draft slot, so parallel drafts never share an agent.
+    return load_backend(backend_name).create_stage_agents(session.openai_api_key, session.search_api_key, model_id)
+
+
+def browser_session(info, openai_api_key, search_api_key):
+    """This browser session's keys. They live in its session state only; every LLM and search
+    request waits for this session's turn within the keys' budgets."""
+    session_id = st.session_state.setdefault("session_id", secrets.token_hex(8))
+    return scheduler.Session(session_id, openai_api_key, search_api_key, info.search_provider)
+
+
+def run_direct(name, session, user_request, quality_pass, variants, run_started):
+    info = BACKENDS[name]
+    backend = load_backend(name)
+    router = load_router(info.model_id)
+    stage_fns = build_stage_fns(
+        backend, lambda model, slot=0: load_stage_agents(name, session, model, slot), router,
+        quality_pass=quality_pass, variants=variants,
+    )
+    stage_fns = memoize_stages(stage_fns, name, router, {"quality_pass": quality_pass, "variants": variants})
+    with st.status("Running direct pipeline...", expanded=True) as status, scheduler.use_session(session):
+        job = run_stages(
+            stage_fns, user_request, on_stage=lambda stage: status.write(f"▶️ {stage}"),
+            backend=name, mode="direct", model=info.model_id,
+        )
+        status.update(label="Done", state="error" if job.error else "complete", expanded=False)
+    if job.error is not None:
+        st.error(f"An error occurred (trace {job.trace_id[:8]}): {job.error}")
+    script = job.state.get("script", "")
+    if script:
+        script = save_script(job.state["url"], script, job.state["facts"])
+    breakdown = job.breakdown()
+    breakdown.append({"stage": "total (wall)", "seconds": round(time.perf_counter() - run_started, 2), **{
+        key: sum(row.get(key, 0) for row in breakdown) for key in ("llm_calls", "input_tokens", "cached_tokens", "output_tokens")
+    }})
+    st.markdown("## Your One Piece YouTube Short Script:")
+    st.markdown("---")
+    st.write(script)
+    render_trimmed(job.state.get("voiceover", {}).get("trimmed"))
+    if job.state.get("draft_scores"):
+        with st.expander(f"🏆 Draft ranking ({len(job.state['draft_scores'])} drafts, best first)"):
+            st.dataframe(job.state["draft_scores"], hide_index=True)
+    return script, breakdown, job.state.get("url")
+
+
+def run_delegation(name, session, agents, user_request, stream_output, run_started):
+    info = BACKENDS[name]
+    backend = load_backend(name)
+    script, breakdown, url = "", None, None
+    run_span = tracing.start_span("pipeline", request=user_request, backend=name, mode="delegation", model=info.model_id)
+    token = tracing.activate(run_span)
+    try:
+        # The framework makes its own LLM requests, so the whole run takes one turn for the usual
+        # number of calls and the real usage is settled afterwards. Searches still wait per request.
+        with scheduler.use_session(session):
+            ticket = scheduler.llm_turn(user_request, requests=info.llm_calls)
+            if stream_output:
+                st.markdown("## Your One Piece YouTube Short Script:")
+                st.markdown("---")
+                script, time_to_first_token = render_stream(backend.stream_pipeline(agents, user_request))
+                record_time_to_first_token(time_to_first_token)
+            else:
+                with st.spinner("🔍 Searching for viral One Piece topics..."):
+                    script = backend.run_pipeline(agents, user_request)
+            breakdown = backend.delegation_breakdown(agents, time.perf_counter() - run_started)
+            ticket.settle(breakdown[-1])
+            url = backend.research_url(agents)
+            script, timing = fit_script(script) if script else (script, None)
+            if script:
+                script = save_script(url, script)
+            if not stream_output:
+                st.markdown("## Your One Piece YouTube Short Script:")
+                st.markdown("---")
+                st.write(script)
+            render_trimmed(timing.trimmed if timing else None)
+    except Exception as e:
+        run_span.error = f"{type(e).__name__}: {e}"
+        st.error(f"An error occurred (trace {run_span.trace_id[:8]}): {str(e)}")
+        st.info("Please check your API keys and try again.")
+    finally:
+        tracing.deactivate(token)
+        tracing.end_span(run_span)
+    return script, breakdown, url
+
+
+@st.fragment(run_every=1)
+def poll_job(job_id):
+    job = get_jobs().get(job_id)
+    if job.finished or job.status == "interrupted":
+        st.rerun()
+    stage = f", {job.stage}" if job.stage else ""
+    st.info(f"⏳ Job {job_id[:8]} {job.status}{stage}: {len(job.completed_stages)}/{len(STAGE_NAMES)} stages done. You can close this tab and come back.")
+
+
+def show_job(job_id, session):
+    """Progress of a background job while it runs, then its result (with Resume if it failed)."""
+    job = get_jobs().get(job_id)
+    if job is None:
+        st.warning(f"Job {job_id} not found.")
+        return
+    if not job.finished and job.status != "interrupted":
+        poll_job(job_id)
+        return
+    script = render_job_result(job)
+    if script:
+        render_violations(check_script(script, (job.result or {}).get("url")))
+        render_voiceover(script, f"job_{job_id}")
+        st.markdown("---")
+        st.caption(prompts.SCRIPT_TIP)
+    if job.status in ("error", "interrupted") and session is not None:
+        if st.button(f"Resume from {job.stage or 'the start'}"):
+            get_jobs().resume(job_id, session.openai_api_key, session.search_api_key, session.id)
+            st.rerun()
+    if job.regenerable_stages and session is not None:
+        # Everything before the chosen stage is reused, so a new draft costs only the writer call.
+        stages = job.regenerable_stages
+        left, right = st.columns([3, 1])
+        stage = left.selectbox("Regenerate from stage", stages, index=stages.index("write") if "write" in stages else 0)
+        if right.button("Regenerate"):
+            st.query_params["job"] = get_jobs().regenerate(job_id, stage, session.openai_api_key, session.search_api_key, session.id)
+            st.rerun()
+    breakdown = PipelineJob(job.request, timings=job.timings, usage=job.usage).breakdown()
+    if breakdown:
+        st.session_state.setdefault("orchestration_breakdowns", {})[f"{job.backend}: Background job"] = breakdown
+
+
+def render_sidebar(info, session=None):
+    st.sidebar.markdown("## 🎯 Script Success Tips")
+    st.sidebar.markdown(prompts.SIDEBAR_TIPS)
+
+    st.sidebar.markdown("## 📝 Script Format Example")
+    st.sidebar.markdown(prompts.SIDEBAR_FORMAT_EXAMPLE)
+
+    st.sidebar.markdown("## 📊 Example Performance")
+    st.sidebar.markdown(prompts.SIDEBAR_PERFORMANCE)
+
+    st.sidebar.markdown("## 🛠️ Installation Requirements")
+    st.sidebar.code(f"{info.requirements}\npip install streamlit", language="bash")
+
+    st.sidebar.markdown("## 🗄️ Fetch Cache")
+    cache_stats = get_cache().stats()
+    st.sidebar.markdown(f"""
+    - Hits: {sum(cache_stats["hits"].values())} · Misses: {sum(cache_stats["misses"].values())} · Evictions: {cache_stats["evictions"]}
+    - Stored: {cache_stats["entries"]} entries, {cache_stats["bytes"] / 1024:.0f} KiB of {cache_stats["max_bytes"] / 1024 / 1024:.0f} MiB
+    """)
+    if st.sidebar.button("Clear fetch cache"):
+        get_cache().clear()
+        st.rerun()
+
+    st.sidebar.markdown("## 📄 Page Extraction")
+    reports = extraction_reports()
+    if reports:
+        st.sidebar.markdown("\n".join(
+            f"- {report.url.rsplit('/', 1)[-1]}: {report.raw_tokens} → {report.sheet_tokens} tokens (saved {report.saved_tokens})"
+            for report in reports[-5:]
+        ))
+    else:
+        st.sidebar.caption("No pages extracted yet.")
+
+    render_streaming_metrics()
+    render_history()
+    render_jobs()
+    if session is not None:
+        render_budgets(session)
+
+
+def main(default_backend="agno"):
+    rerun_started = time.perf_counter()
+
+    st.title("One Piece YouTube Shorts AI Agent 🏴‍☠️")
+    st.caption("Generate viral One Piece YouTube shorts scripts about unfamiliar abilities and hidden stories")
+
+    names = sorted(BACKENDS)
+    name = st.radio("Backend", names, index=names.index(default_backend), horizontal=True)
+    info = BACKENDS[name]
+
+    openai_api_key = st.text_input("Enter OpenAI API Key to access GPT-4o", type="password")
+    search_api_key = st.text_input(f"Enter {info.search_key_label} for Search functionality", type="password", key=f"{name}_search_key")
+
+    build_seconds = setup_seconds = None
+    session = browser_session(info, openai_api_key, search_api_key) if openai_api_key and search_api_key else None
+    if session is not None:
+        user_request = st.text_input("Any specific One Piece character or topic you want to focus on? (Leave blank for AI to choose)")
+
+        orchestration = st.radio("Orchestration", [info.delegation_label, DIRECT_PIPELINE], horizontal=True)
+        stream_output = st.toggle("Stream output", value=True, disabled=orchestration == DIRECT_PIPELINE)
+        quality_pass = st.toggle(
+            "Full editor pass", value=False, disabled=orchestration != DIRECT_PIPELINE,
+            help="Always run the editor. Otherwise it only runs to fix lines that break the format rules.",
+        )
+        variants = st.slider(
+            "Drafts", min_value=1, max_value=5, value=1, disabled=orchestration != DIRECT_PIPELINE,
+            help="Write several drafts from the same wiki page in parallel and send only the best-ranked one to the editor.",
+        )
+        background = st.toggle(
+            "Run in background", value=True, disabled=orchestration != DIRECT_PIPELINE,
+            help="Queue the run as a job that survives reruns and closed tabs; a failed job can be resumed from its last stage.",
+        )
+
+        if st.button("Generate One Piece Short Script"):
+            if orchestration == DIRECT_PIPELINE and background:
+                job_id = get_jobs().submit(user_request, name, openai_api_key, search_api_key, quality_pass, variants, session.id)
+                # The job ID in the URL brings the result back after a reload or from another tab.
+                st.query_params["job"] = job_id
+                script, breakdown, url = "", None, None
+            elif orchestration == DIRECT_PIPELINE:
+                script, breakdown, url = run_direct(name, session, user_request, quality_pass, variants, time.perf_counter())
+            else:
+                setup_started = time.perf_counter()
+                with st.spinner(f"Loading {name}..."):
+                    agents, build_seconds = load_agents(name, session)
+                setup_seconds = time.perf_counter() - setup_started
+                script, breakdown, url = run_delegation(name, session, agents, user_request, stream_output, time.perf_counter())
+            if script:
+                # In delegation mode this is the only check of the script against the page.
+                render_violations(check_script(script, url))
+                render_voiceover(script, "generated")
+                st.markdown("---")
+                st.caption(prompts.SCRIPT_TIP)
+            if breakdown:
+                st.session_state.setdefault("orchestration_breakdowns", {})[f"{name}: {orchestration}"] = breakdown
+
+        if "job" in st.query_params:
+            show_job(st.query_params["job"], session)
+
+        breakdowns = st.session_state.get("orchestration_breakdowns", {})
+        if breakdowns:
+            st.markdown("### ⏱️ Latency and Token Breakdown")
+            for column, (mode, rows) in zip(st.columns(len(breakdowns)), sorted(breakdowns.items())):
+                column.markdown(f"**{mode}** (last run)")
+                column.dataframe(rows, hide_index=True)
+
+        render_recent_runs()
+
+    else:
+        st.info("Please enter both API keys to get started.")
+        st.markdown(f"""
+        ### Required API Keys:
+        1. **OpenAI API Key**: Get from [OpenAI Platform](https://platform.openai.com/api-keys)
+        2. **{info.search_key_label}**: Get from {info.search_key_link}
+        """)
+        if "job" in st.query_params:
+            show_job(st.query_params["job"], None)
+
+    render_sidebar(info, session)
+
+    st.sidebar.markdown("## ⏱️ Startup Timing")
+    if st.sidebar.button("Rebuild agents"):
+        load_agents.clear()
+        load_stage_agents.clear()
+        st.rerun()
+    if build_seconds is not None:
+        st.sidebar.markdown(f"""
+    - Framework import and agent build (first run): {build_seconds * 1000:.0f} ms
+    - Agent setup this rerun: {setup_seconds * 1000:.1f} ms
+    - Saved by cache: {max(build_seconds - setup_seconds, 0) * 1000:.0f} ms
+    - Total rerun: {(time.perf_counter() - rerun_started) * 1000:.0f} ms
+    """)
+    else:
+        st.sidebar.caption(f"Total rerun: {(time.perf_counter() - rerun_started) * 1000:.0f} ms")
@@ -0,0 +1,269 @@
+import functools
+import importlib
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+
+from onepiece_core import prompts, scheduler, tools
+from onepiece_core.grounding import check_script
+from onepiece_core.history import DuplicateTopicError
+from onepiece_core.memo import memoize, memoize_stages
+from onepiece_core.pipeline import Stage, fan_out, run_stages
+from onepiece_core.ranking import rank_drafts
+from onepiece_core.routing import load_router, run_with_escalation, stage_usage, sum_usage
+from onepiece_core.validate import apply_repairs
+from onepiece_core.voiceover import voiceover_stage
+
+
+STAGE_NAMES = ("search", "facts", "write", "edit", "voiceover")
+# Stages that call the model; facts and voiceover run locally.
+LLM_STAGES = ("search", "write", "edit")
+NO_USAGE = {"llm_calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+
+
+@dataclass(frozen=True)
+class Backend:
+    """What the app, batch runner and bench need to know about a backend without importing it.
+    ``module`` is the adapter; it is only imported by ``load_backend``."""
+
+    name: str
+    module: str
+    model_id: str
+    search_key_env: str
+    search_provider: str
+    search_key_label: str
+    search_key_link: str
+    llm_calls: int  # rough LLM requests per script in delegation mode, for rate limiting
+    delegation_label: str
+    requirements: str
+
+
+BACKENDS = {
+    "agno": Backend(
+        name="agno",
+        module="onepiece_core.agno_backend",
+        model_id="gpt-4.1-mini",
+        search_key_env="SERP_API_KEY",
+        search_provider="serpapi",
+        search_key_label="Serp API Key",
+        search_key_link="[SerpApi](https://serpapi.com/)",
+        llm_calls=7,
+        delegation_label="Team delegation",
+        requirements="pip install agno openai",
+    ),
+    "crewai": Backend(
+        name="crewai",
+        module="onepiece_core.crewai_backend",
+        model_id="gpt-4o-mini",
+        search_key_env="SERPER_API_KEY",
+        search_provider="serper",
+        search_key_label="Serper API Key",
+        search_key_link="[Serper.dev](https://serper.dev/) (Free tier available)",
+        llm_calls=6,
+        delegation_label="Crew",
+        requirements="pip install crewai",
+    ),
+}
+
+
+def load_backend(name):
+    """Import a backend adapter (and its framework) on first use."""
+    return importlib.import_module(BACKENDS[name].module)
+
+
+def with_local_stages(stage_fns):
+    """``(name, fn)`` stages followed by the local post-processing every backend shares: fitting
+    the script into the voiceover window."""
+    return [*stage_fns, ("voiceover", voiceover_stage)]
+
+
+def build_stage_fns(backend, stage_agents, router, quality_pass=False, variants=1):
+    """The direct pipeline's ``(name, fn)`` stages for the adapter module ``backend``, voiceover included.
+
+    Searcher, writer and editor are called directly in code; only the URL, the fact sheet and the
+    draft are passed along, instead of routing every handoff through the editor model. The format
+    rules, and the numbers and fruit names against the cached wiki page, are checked locally after
+    the writer: a clean draft skips the editor unless a quality pass is requested, and a draft with
+    violations only sends the offending lines. Each stage runs on its routed model and escalates
+    once when its output fails validation. With ``variants`` > 1 the writer drafts that many scripts
+    in parallel from the same fact sheet (one writer per slot) and only the best-ranked draft goes on
+    to the editor. ``stage_agents(model, slot)`` returns the adapter's agents for a model; the adapter's
+    ``run_stage_agent(stage_agents, role, model, slot, **inputs)`` runs one of them and returns
+    ``(text, usage)``."""
+    def run_agent(role, model, slot=0, **inputs):
+        return backend.run_stage_agent(stage_agents, role, model, slot, **inputs)
+
+    def search(state):
+        attempts = run_with_escalation(
+            router, "search", lambda model: run_agent("search", model, request=state["request"]),
+            ok=lambda attempt: tools.find_wiki_url(attempt[0]) is not None,
+        )
+        research = attempts[-1][0]
+        url = tools.find_wiki_url(research)
+        if url is None:
+            raise ValueError("the topic searcher did not return a One Piece Wiki URL")
+        return {"research": research, "url": url, "usage": stage_usage(router, "search", [usage for _, usage in attempts])}
+
+    def facts(state):
+        # Rejects a repeated topic here, before the writer spends tokens on it.
+        return {"facts": tools.read_new_topic(state["url"])}
+
+    def write(state):
+        def draft(slot):
+            angle = prompts.writer_angle(slot)
+            return run_agent("write", router.model("write"), slot, url=state["url"], facts=state["facts"], angle=angle)
+
+        drafts = fan_out(draft, variants)
+        usage = stage_usage(router, "write", [sum_usage(usage for _, usage in drafts)])
+        if variants == 1:
+            return {"draft": drafts[0][0], "usage": usage}
+        scores = rank_drafts([text for text, _ in drafts], state["facts"])
+        usage["variants"] = len(drafts)
+        return {"draft": scores[0].draft, "draft_scores": [score.to_dict() for score in scores], "usage": usage}
+
+    def edit(state):
+        report = check_script(state["draft"], state["url"])
+        if report.ok and not quality_pass:
+            return {"script": state["draft"], "violations": [], "draft_violations": [], "usage": dict(NO_USAGE)}
+
+        def run(model):
+            if quality_pass:
+                return run_agent("edit", model, draft=state["draft"], facts=state["facts"])
+            text, usage = run_agent("repair", model, draft=state["draft"], report=report)
+            return apply_repairs(state["draft"], text), usage
+
+        attempts = run_with_escalation(router, "edit", run, ok=lambda attempt: check_script(attempt[0], state["url"]).ok)
+        script = attempts[-1][0]
+        return {
+            "script": script,
+            "violations": check_script(script, state["url"]).to_dicts(),
+            "draft_violations": report.to_dicts(),
+            "usage": stage_usage(router, "edit", [usage for _, usage in attempts]),
+        }
+
+    return with_local_stages([("search", search), ("facts", facts), ("write", write), ("edit", edit)])
+
+
+def create_stages(name, openai_api_key, search_api_key, model_id=None, workers=1, router=None, quality_pass=False, variants=1, memo=True):
+    """Direct-pipeline stages for ``AsyncPipeline``. Each worker builds its own agents, per model and
+    draft slot on first use (escalation models usually never are). With ``memo`` stage outputs are
+    reused for inputs seen before."""
+    backend = load_backend(name)
+    router = router or load_router(model_id or BACKENDS[name].model_id)
+    options = {"quality_pass": quality_pass, "variants": variants}
+
+    def make(index):
+        def make_fn():
+            stage_agents = functools.lru_cache(maxsize=None)(
+                lambda model, slot=0: backend.create_stage_agents(openai_api_key, search_api_key, model)
+            )
+            stage, fn = build_stage_fns(backend, stage_agents, router, quality_pass, variants)[index]
+            return memoize(stage, fn, name, router.model(stage), options) if memo else fn
+
+        return make_fn
+
+    return [Stage(stage, make(index), workers) for index, stage in enumerate(STAGE_NAMES)]
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of one script run. ``status`` is ``ok``, ``duplicate`` (an earlier short covered the
+    topic) or ``error``."""
+
+    request: str
+    backend: str
+    status: str = "ok"
+    script: str = ""
+    url: str = None
+    number: int = None
+    violations: list = field(default_factory=list)
+    error: str = None
+    trace_id: str = None
+    stage_seconds: dict = field(default_factory=dict)
+    stage_usage: dict = field(default_factory=dict)
+    draft_scores: list = field(default_factory=list)
+    voiceover: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    @classmethod
+    def from_job(cls, job, backend):
+        result = cls(
+            request=job.request,
+            backend=backend,
+            script=job.state.get("script", ""),
+            url=job.state.get("url"),
+            violations=job.state.get("violations", []),
+            trace_id=job.trace_id,
+            stage_seconds={stage: round(seconds, 2) for stage, seconds in job.timings.items()},
+            stage_usage=job.usage,
+            draft_scores=job.state.get("draft_scores", []),
+            voiceover=job.state.get("voiceover", {}),
+        )
+        if isinstance(job.exception, DuplicateTopicError):
+            result.status, result.error = "duplicate", str(job.exception)
+        elif job.error is not None:
+            result.status, result.error = "error", job.error
+        return result
+
+    def save(self, facts=None):
+        """Number the script through the history; a topic covered in the meantime (or a run without
+        a wiki URL) changes the status instead of raising."""
+        if not self.ok:
+            return self
+        if self.url is None:
+            self.status, self.error = "error", "no One Piece Wiki URL in the research"
+            return self
+        try:
+            entry = tools.record_script(self.url, self.script, facts)
+        except DuplicateTopicError as e:
+            self.status, self.error = "duplicate", str(e)
+            return self
+        self.number, self.script = entry.number, entry.script
+        return self
+
+    def to_dict(self):
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+_local = threading.local()
+
+
+def thread_stage_agents(backend, openai_api_key, search_api_key):
+    """``stage_agents(model, slot)`` for the calling thread, built on first use per model and slot.
+    Rebuilt when the thread switches to other keys, so agents are never shared between threads."""
+    key = (backend, openai_api_key, search_api_key)
+    if getattr(_local, "key", None) != key:
+        adapter = load_backend(backend)
+        _local.key = key
+        _local.stage_agents = functools.lru_cache(maxsize=None)(
+            lambda model, slot=0: adapter.create_stage_agents(openai_api_key, search_api_key, model)
+        )
+    return _local.stage_agents
+
+
+def direct_stage_fns(backend, openai_api_key, search_api_key, quality_pass=False, variants=1, refresh_from=None):
+    """The backend's direct-pipeline ``(name, fn)`` stages on this thread's agents, memoized;
+    ``refresh_from`` names the first stage that has to run again even for inputs seen before."""
+    stage_agents = thread_stage_agents(backend, openai_api_key, search_api_key)
+    router = load_router(BACKENDS[backend].model_id)
+    stage_fns = build_stage_fns(load_backend(backend), stage_agents, router, quality_pass, variants)
+    options = {"quality_pass": quality_pass, "variants": variants}
+    return memoize_stages(stage_fns, backend, router, options, refresh_from)
+
+
+def generate(request="", backend="agno", openai_api_key=None, search_api_key=None, quality_pass=False, variants=1, save=True, session_id=scheduler.DEFAULT_SESSION):
+    """Write one script with the direct pipeline and return a ``ScriptResult``; the library entry
+    point for scripts and workers. Keys default to the environment. Agents are reused per thread.
+    ``variants`` > 1 drafts several scripts from one fact sheet and keeps the best-ranked one.
+    Requests wait for ``session_id``'s turn within the keys' budgets."""
+    info = BACKENDS[backend]
+    openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
+    search_api_key = search_api_key or os.environ.get(info.search_key_env)
+    stage_fns = direct_stage_fns(backend, openai_api_key, search_api_key, quality_pass, variants)
+    with scheduler.use_session(scheduler.Session(session_id, openai_api_key, search_api_key, info.search_provider)):
+        job = run_stages(stage_fns, request, backend=backend, mode="direct", model=info.model_id)
+    result = ScriptResult.from_job(job, backend)
+    return result.save(job.state.get("facts")) if save else result
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# How long each kind of fetch stays fresh. Search rankings drift faster than wiki pages. "stage"
+# holds memoized pipeline stage outputs, which only change with their inputs.
+DEFAULT_TTLS = {
+    "serpapi": DAY,
+    "serper": DAY,
+    "page": 7 * DAY,
+    "stage": 30 * DAY,
+}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Expired entries with an ETag or Last-Modified are kept this much longer, so a conditional GET
+# can revalidate them instead of downloading the page again.
+STALE_GRACE = 30 * DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validators (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+
+def cache_dir():
+    path = os.environ.get("ONEPIECE_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "onepiece_shorts")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not k.startswith("utm_")))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+
+def normalize_key(source, key):
+    if source == "page":
+        return normalize_url(key)
+    return normalize_query(key)
+
+
+class ContentCache:
+    """SQLite-backed cache for search results and fetched pages.
+
+    Entries map a normalized (source, key) pair to the digest of their body, and bodies are
+    stored zlib-compressed once per digest, so identical pages reached through different URLs
+    share storage. Entries expire after their source's TTL, and the least recently used
+    entries are evicted once the compressed bodies exceed ``max_bytes``. Expired entries that
+    carry HTTP validators are kept for ``STALE_GRACE`` so they can be revalidated.
+    """
+
+    def __init__(self, path=None, ttls=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(cache_dir(), "content.sqlite3")
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _entry_key(self, source, key):
+        return hashlib.sha256(f"{source}\n{normalize_key(source, key)}".encode("utf-8")).hexdigest()
+
+    def _ttl(self, source):
+        return self.ttls.get(source, DAY)
+
+    def get(self, source, key):
+        entry_key = self._entry_key(source, key)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT e.created, b.data FROM entries e JOIN blobs b ON b.digest = e.digest WHERE e.key = ?",
+                (entry_key,),
+            ).fetchone()
+            if row is None or now - row[0] > self._ttl(source):
+                with self._lock:
+                    self.misses[source] += 1
+                return None
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, entry_key))
+        with self._lock:
+            self.hits[source] += 1
+        return zlib.decompress(row[1]).decode("utf-8")
+
+    def _stale(self, source, key):
+        """Expired body and its validators, if the server gave any."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT b.data, v.etag, v.last_modified FROM entries e JOIN blobs b ON b.digest = e.digest "
+                "JOIN validators v ON v.key = e.key WHERE e.key = ?",
+                (self._entry_key(source, key),),
+            ).fetchone()
+        if row is None:
+            return None, {}
+        return zlib.decompress(row[0]).decode("utf-8"), {"etag": row[1], "last_modified": row[2]}
+
+    def put(self, source, key, body, validators=None):
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        data = zlib.compress(raw, 6)
+        now = time.time()
+        entry_key = self._entry_key(source, key)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, data, size) VALUES (?, ?, ?)",
+                (digest, data, len(data)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, source, digest, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (entry_key, source, digest, now, now),
+            )
+            if validators and (validators.get("etag") or validators.get("last_modified")):
+                conn.execute(
+                    "INSERT OR REPLACE INTO validators (key, etag, last_modified) VALUES (?, ?, ?)",
+                    (entry_key, validators.get("etag"), validators.get("last_modified")),
+                )
+            else:
+                conn.execute("DELETE FROM validators WHERE key = ?", (entry_key,))
+            self._evict(conn, now)
+
+    def get_or_fetch(self, source, key, fetch):
+        body = self.get(source, key)
+        if body is None:
+            body = fetch()
+            self.put(source, key, body)
+        return body
+
+    def get_or_revalidate(self, source, key, fetch):
+        """Like ``get_or_fetch`` for HTTP bodies. ``fetch(validators)`` gets the validators of an
+        expired copy (or ``{}``) and returns ``(body, validators)``, with ``body=None`` when the
+        server answered 304 Not Modified; the stale copy is then refreshed and returned."""
+        body = self.get(source, key)
+        if body is not None:
+            return body
+        stale, validators = self._stale(source, key)
+        body, validators = fetch(validators)
+        if body is None:
+            if stale is None:
+                raise ValueError(f"{source} {key}: 304 Not Modified without a cached copy")
+            body = stale
+            with self._lock:
+                self.revalidations += 1
+        self.put(source, key, body, validators)
+        return body
+
+    def _evict(self, conn, now):
+        for source in {row[0] for row in conn.execute("SELECT DISTINCT source FROM entries")}:
+            expired = now - self._ttl(source)
+            conn.execute(
+                "DELETE FROM entries WHERE source = ? AND created < ? AND key NOT IN (SELECT key FROM validators)",
+                (source, expired),
+            )
+            conn.execute("DELETE FROM entries WHERE source = ? AND created < ?", (source, expired - STALE_GRACE))
+        conn.execute("DELETE FROM validators WHERE key NOT IN (SELECT key FROM entries)")
+        conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)")
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for entry_key, digest in conn.execute("SELECT key, digest FROM entries ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM entries WHERE key = ?", (entry_key,))
+            evicted += 1
+            if not conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                total -= conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()[0]
+                conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            if total <= self.max_bytes:
+                break
+        conn.execute("DELETE FROM validators WHERE key NOT IN (SELECT key FROM entries)")
+        with self._lock:
+            self.evictions += evicted
+
+    def clear(self, source=None):
+        with self._connect() as conn:
+            if source is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE source = ?", (source,))
+            conn.execute("DELETE FROM validators WHERE key NOT IN (SELECT key FROM entries)")
+            conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)")
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM entries), (SELECT COALESCE(SUM(size), 0) FROM blobs)"
+            ).fetchone()
+        with self._lock:
+            return {
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "evictions": self.evictions,
+                "revalidations": self.revalidations,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_bytes = int(os.environ.get("ONEPIECE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+            _default_cache = ContentCache(max_bytes=max_bytes)
+        return _default_cache
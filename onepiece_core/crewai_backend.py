@@ -0,0 +1,320 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from crewai import Agent, Task, Crew, LLM, Process
+from crewai.events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent, crewai_event_bus
+from crewai.tools import tool
+from crewai.types.streaming import StreamChunkType
+
+from onepiece_core import prompts, scheduler, tools, tracing
+from onepiece_core.backends import BACKENDS
+from onepiece_core.routing import ModelRouter, load_router
+from onepiece_core.streaming import StreamEvent
+from onepiece_core.validate import repair_prompt
+
+
+MODEL_ID = BACKENDS["crewai"].model_id
+
+
+def create_agents(openai_api_key, serper_api_key, model_id=MODEL_ID, router=None):
+    # The full crew has no per-stage validation or escalation, so every role stays on the backend
+    # model unless a "lead" route is configured, like agno's team; the direct stages pass a router
+    # pinned to their routed model. crewai's own LLM carries the key itself, so sessions with
+    # different keys never share one through the environment.
+    router = router or load_router(model_id)
+    llm = LLM(
+        model=router.model("lead"),
+        temperature=0.7,
+        api_key=openai_api_key
+    )
+
+    @tool("Search the One Piece Wiki")
+    def search_tool(search_query: str) -> str:
+        """Search One Piece Wiki character pages and return the top results (title, link, snippet) as JSON.
+        Results from the local wiki index also include height_cm, devil_fruit, inlinks (popularity)
+        and a 0-1 surprise score. Falls back to Google when there is no local match."""
+        return tools.wiki_search(search_query, 10, lambda q, n: tools.serper_search(q, serper_api_key, n))
+
+    @tool("Read website content")
+    def scrape_tool(website_url: str) -> str:
+        """Read a One Piece Wiki page and return a compact fact sheet: infobox (height, devil fruit,
+        bounty, affiliations) plus the Abilities, History and Trivia sections."""
+        return tools.read_website(website_url)
+
+    topic_searcher = Agent(
+        role=prompts.SEARCHER.title,
+        goal=prompts.SEARCHER.goal,
+        backstory=prompts.SEARCHER.backstory,
+        tools=[search_tool],
+        llm=llm,
+        verbose=True,
+        allow_delegation=False,
+        max_iter=3
+    )
+
+    script_writer = Agent(
+        role=prompts.WRITER.title,
+        goal=prompts.WRITER.goal,
+        backstory=prompts.WRITER.backstory,
+        tools=[scrape_tool],
+        llm=llm,
+        verbose=True,
+        allow_delegation=False,
+        max_iter=3
+    )
+
+    editor = Agent(
+        role=prompts.EDITOR.title,
+        goal=prompts.EDITOR.goal,
+        backstory=prompts.EDITOR.backstory,
+        tools=[],
+        llm=llm,
+        verbose=True,
+        allow_delegation=False,
+        max_iter=2
+    )
+
+    return topic_searcher, script_writer, editor
+
+
+# crewai reports LLM calls on its event bus, possibly from another thread, so calls are tied
+# back to the active stage/pipeline span through the id of the task that made them.
+_task_spans = {}
+_llm_call_started = {}
+_tracing_lock = threading.Lock()
+_tracing_installed = False
+
+
+def install_tracing():
+    global _tracing_installed
+    with _tracing_lock:
+        if _tracing_installed:
+            return
+        _tracing_installed = True
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_call_started(source, event):
+        _llm_call_started[event.call_id] = time.perf_counter()
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def on_llm_call_completed(source, event):
+        started = _llm_call_started.pop(event.call_id, None)
+        usage = event.usage or {}
+        tracing.record_llm_call(
+            event.model,
+            time.perf_counter() - started if started is not None else 0.0,
+            usage.get("prompt_tokens", 0),
+            usage.get("completion_tokens", 0),
+            parent=_task_spans.get(event.task_id),
+            agent=event.agent_role,
+            cached_tokens=usage.get("cached_prompt_tokens"),
+            prefix_sha=tracing.prefix_digest(_system_prompt(event.messages)),
+        )
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def on_llm_call_failed(source, event):
+        started = _llm_call_started.pop(event.call_id, None)
+        tracing.record_llm_call(
+            event.model,
+            time.perf_counter() - started if started is not None else 0.0,
+            0,
+            0,
+            parent=_task_spans.get(event.task_id),
+            error=event.error,
+            agent=event.agent_role,
+        )
+
+
+def _system_prompt(messages):
+    if isinstance(messages, list):
+        return next((str(m.get("content", "")) for m in messages if isinstance(m, dict) and m.get("role") == "system"), "")
+    return ""
+
+
+@contextmanager
+def traced_tasks(tasks):
+    install_tracing()
+    current = tracing.current_span()
+    for task in tasks:
+        _task_spans[str(task.id)] = current
+    try:
+        yield
+    finally:
+        for task in tasks:
+            _task_spans.pop(str(task.id), None)
+
+
+def create_research_task(topic_searcher, user_request=""):
+    search_query = prompts.research_query(user_request, tools.covered_topics_hint())
+    # Static instructions first and the request last, so the prompt prefix stays cacheable.
+    return Task(
+        description=prompts.RESEARCH_TASK + f"\nSearch for: {search_query}\n",
+        agent=topic_searcher,
+        expected_output="A single One Piece Wiki URL with explanation of why it's viral-worthy and key surprising facts"
+    )
+
+
+def create_writing_task(script_writer, context=None, url="", fact_sheet="", angle=""):
+    description = prompts.WRITING_TASK
+    if fact_sheet:
+        description += (
+            f"\nWiki page: {url}\n"
+            f"Fact sheet (already read with the read website content tool, do not read the page again):\n{fact_sheet}\n"
+        )
+    if angle:
+        description += f"\nAngle: {angle}\n"
+    return Task(
+        description=description,
+        agent=script_writer,
+        expected_output="A viral YouTube Shorts script following the exact format with dramatic hooks and surprising reveals",
+        **({"context": context} if context else {})
+    )
+
+
+def create_editing_task(editor, context=None, draft="", fact_sheet=""):
+    description = prompts.EDITING_TASK
+    if draft:
+        description += f"\nScript to edit:\n{draft}\n"
+    if fact_sheet:
+        description += f"\nWiki fact sheet to verify facts against:\n{fact_sheet}\n"
+    return Task(
+        description=description,
+        agent=editor,
+        expected_output="A polished, grammatically perfect YouTube Shorts script optimized for maximum engagement",
+        **({"context": context} if context else {})
+    )
+
+
+def create_repair_task(editor, draft, report):
+    # Only the flagged lines and the rules go to the model, not the full editing brief.
+    return Task(
+        description=repair_prompt(draft, report),
+        agent=editor,
+        expected_output="Only the fixed lines, one per line, as `<number>: <text>`",
+    )
+
+
+def create_tasks(agents, user_request=""):
+    topic_searcher, script_writer, editor = agents
+    topic_research_task = create_research_task(topic_searcher, user_request)
+    script_writing_task = create_writing_task(script_writer, context=[topic_research_task])
+    editing_task = create_editing_task(editor, context=[topic_research_task, script_writing_task])
+    return [topic_research_task, script_writing_task, editing_task]
+
+
+# Wiki URL and token usage of the last crew run, keyed by the topic searcher agent. Only the most
+# recently used agent sets are kept, like the app's per-session agent caches.
+MAX_LAST_RUNS = 64
+_last_runs = OrderedDict()
+_last_runs_lock = threading.Lock()
+
+
+def _remember_run(agents, research_task, output):
+    url = tools.find_wiki_url(research_task.output.raw) if research_task.output is not None else None
+    with _last_runs_lock:
+        _last_runs[id(agents[0])] = (url, crew_usage(output))
+        _last_runs.move_to_end(id(agents[0]))
+        while len(_last_runs) > MAX_LAST_RUNS:
+            _last_runs.popitem(last=False)
+
+
+def _last_run(agents):
+    with _last_runs_lock:
+        return _last_runs.get(id(agents[0]), (None, None))
+
+
+def research_url(agents):
+    return _last_run(agents)[0]
+
+
+def delegation_breakdown(agents, seconds):
+    # crewai reports token usage for the crew as a whole, not per agent.
+    usage = _last_run(agents)[1] or {"llm_calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+    return [{"stage": "crew (wall)", "seconds": round(seconds, 2), **usage}]
+
+
+def run_pipeline(agents, user_request=""):
+    tasks = create_tasks(agents, user_request)
+    crew = Crew(
+        agents=list(agents),
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=True
+    )
+    with traced_tasks(tasks):
+        output = crew.kickoff()
+    _remember_run(agents, tasks[0], output)
+    return str(output)
+
+
+def stream_pipeline(agents, user_request=""):
+    tasks = create_tasks(agents, user_request)
+    crew = Crew(
+        agents=list(agents),
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=True,
+        stream=True
+    )
+    with traced_tasks(tasks):
+        streaming = crew.kickoff()
+        task_index = None
+        announced_tools = set()
+        for chunk in streaming:
+            if chunk.task_index != task_index:
+                task_index = chunk.task_index
+                yield StreamEvent("stage", chunk.agent_role)
+            if chunk.chunk_type == StreamChunkType.TOOL_CALL:
+                # Tool-call arguments arrive in pieces; announce each call once.
+                call = chunk.tool_call
+                call_key = (task_index, call.tool_id or call.index) if call is not None else None
+                if call is not None and call.tool_name and call_key not in announced_tools:
+                    announced_tools.add(call_key)
+                    yield StreamEvent("tool", f"Calling {call.tool_name}")
+            elif chunk.content:
+                yield StreamEvent("token", chunk.content)
+    _remember_run(agents, tasks[0], streaming.result)
+    yield StreamEvent("result", str(streaming.result))
+
+
+def run_task(agent, task):
+    ticket = scheduler.llm_turn(task.description)
+    with traced_tasks([task]):
+        output = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=True).kickoff()
+    ticket.settle(crew_usage(output))
+    return output
+
+
+def crew_usage(output):
+    usage = output.token_usage
+    return {
+        "llm_calls": usage.successful_requests,
+        "input_tokens": usage.prompt_tokens,
+        "cached_tokens": usage.cached_prompt_tokens,
+        "output_tokens": usage.completion_tokens,
+    }
+
+
+def create_stage_agents(openai_api_key, serper_api_key, model_id=MODEL_ID):
+    """Searcher, writer and editor all on ``model_id``, for one routed model."""
+    return create_agents(openai_api_key, serper_api_key, model_id, ModelRouter(model_id, {}))
+
+
+# Agent (index into ``create_stage_agents``) and task for each role of the direct pipeline.
+ROLE_TASKS = {
+    "search": (0, lambda agent, inputs: create_research_task(agent, inputs["request"])),
+    "write": (1, lambda agent, inputs: create_writing_task(agent, url=inputs["url"], fact_sheet=inputs["facts"], angle=inputs["angle"])),
+    "edit": (2, lambda agent, inputs: create_editing_task(agent, draft=inputs["draft"], fact_sheet=inputs["facts"])),
+    "repair": (2, lambda agent, inputs: create_repair_task(agent, inputs["draft"], inputs["report"])),
+}
+
+
+def run_stage_agent(stage_agents, role, model, slot=0, **inputs):
+    """Run ``role``'s agent on ``model`` as a single-task crew for ``backends.build_stage_fns`` and
+    return ``(text, usage)``."""
+    index, make_task = ROLE_TASKS[role]
+    agent = stage_agents(model, slot)[index]
+    output = run_task(agent, make_task(agent, inputs))
+    return output.raw, crew_usage(output)
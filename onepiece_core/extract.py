@@ -0,0 +1,170 @@
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+
+# Fandom portable-infobox data-source names, with the labels used as a fallback match.
+INFOBOX_FIELDS = [
+    ("height", "Height", ("height",)),
+    ("dfname", "Devil Fruit", ()),
+    ("dfename", "Devil Fruit (English)", ()),
+    ("dftype", "Devil Fruit Type", ()),
+    ("bounty", "Bounty", ("bounty",)),
+    ("affiliation", "Affiliations", ("affiliations",)),
+    ("occupation", "Occupations", ("occupations",)),
+    ("status", "Status", ("status",)),
+    ("age", "Age", ("age",)),
+    ("first", "Debut", ("debut",)),
+]
+SECTIONS = {
+    "abilities": ("abilities and powers", "abilities", "powers and abilities"),
+    "history": ("history",),
+    "trivia": ("trivia",),
+}
+MAX_VALUE_CHARS = 160
+MAX_SECTION_CHARS = {"abilities": 1500, "history": 1500, "trivia": 600}
+CITATION = re.compile(r"\[\s*(?:\d+|citation needed|note \d+)\s*\]", re.IGNORECASE)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+SEPARATORS = re.compile(r"\s*;(?:\s*;)*\s*")
+
+_reports = deque(maxlen=50)
+_reports_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    # Rough GPT tokenizer ratio for English prose; good enough to compare prompt sizes.
+    return (len(text) + 3) // 4
+
+
+def _clean(text):
+    return " ".join(CITATION.sub("", text).split())
+
+
+@dataclass
+class FactSheet:
+    url: str
+    name: str
+    infobox: dict = field(default_factory=dict)
+    abilities: list = field(default_factory=list)
+    history: list = field(default_factory=list)
+    trivia: list = field(default_factory=list)
+
+    def is_empty(self):
+        return not (self.infobox or self.abilities or self.history or self.trivia)
+
+    def render(self):
+        lines = [f"# {self.name}", f"Source: {self.url}"]
+        lines += [f"- {label}: {value}" for label, value in self.infobox.items()]
+        for title, paragraphs in (("Abilities", self.abilities), ("History", self.history), ("Trivia", self.trivia)):
+            if paragraphs:
+                lines += ["", f"## {title}"] + paragraphs
+        return "\n".join(lines)
+
+
+@dataclass
+class ExtractionReport:
+    url: str
+    raw_tokens: int
+    sheet_tokens: int
+
+    @property
+    def saved_tokens(self):
+        return max(self.raw_tokens - self.sheet_tokens, 0)
+
+
+def _infobox(root):
+    box = root.select_one("aside.portable-infobox")
+    if box is None:
+        return {}
+    by_source, by_label = {}, {}
+    for item in box.select(".pi-data"):
+        value_tag = item.select_one(".pi-data-value")
+        if value_tag is None:
+            continue
+        for br in value_tag.find_all("br"):
+            br.replace_with("; ")
+        value = SEPARATORS.sub("; ", _clean(value_tag.get_text(" "))).strip(" ;")
+        by_source.setdefault(item.get("data-source", ""), value)
+        label_tag = item.select_one(".pi-data-label")
+        if label_tag is not None:
+            by_label.setdefault(_clean(label_tag.get_text()).rstrip(":").lower(), value)
+    infobox = {}
+    for source, label, fallbacks in INFOBOX_FIELDS:
+        value = by_source.get(source) or next((by_label[name] for name in fallbacks if name in by_label), "")
+        if value:
+            infobox[label] = value[:MAX_VALUE_CHARS].rstrip(" ;,")
+    return infobox
+
+
+def _heading_text(tag):
+    if tag.name == "h2" or (tag.name == "div" and "mw-heading2" in (tag.get("class") or [])):
+        return _clean(tag.get_text()).lower()
+    return None
+
+
+def _sections(root):
+    collected = {name: [] for name in SECTIONS}
+    current = None
+    for tag in root.find_all(recursive=False):
+        heading = _heading_text(tag)
+        if heading is not None:
+            current = next((name for name, titles in SECTIONS.items() if heading in titles), None)
+            continue
+        if current is None or tag.name not in ("p", "ul", "ol", "h3", "div"):
+            continue
+        if tag.name == "div" and "mw-heading3" not in (tag.get("class") or []):
+            continue
+        if tag.name in ("h3", "div"):
+            collected[current].append(f"### {_clean(tag.get_text())}")
+        elif tag.name == "p":
+            collected[current].append(_clean(tag.get_text(" ")))
+        else:
+            collected[current] += [f"- {_clean(li.get_text(' '))}" for li in tag.find_all("li", recursive=False)]
+    return {name: _trim(name, [text for text in texts if text]) for name, texts in collected.items()}
+
+
+def _trim(section, paragraphs):
+    budget = MAX_SECTION_CHARS[section]
+    kept = []
+    for paragraph in paragraphs:
+        if budget <= 0:
+            break
+        if len(paragraph) > budget:
+            sentences, paragraph = SENTENCE_END.split(paragraph), ""
+            for sentence in sentences:
+                if len(paragraph) + len(sentence) > budget:
+                    break
+                paragraph = f"{paragraph} {sentence}".strip()
+            if not paragraph:
+                break
+        kept.append(paragraph)
+        budget -= len(paragraph)
+    # Drop sub-headings that ended up with nothing under them.
+    return [p for i, p in enumerate(kept) if not p.startswith("### ") or (i + 1 < len(kept) and not kept[i + 1].startswith("### "))]
+
+
+def extract_fact_sheet(html, url):
+    # Imported on first parse: bs4 and soupsieve are a large share of the app's cold start.
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    root = soup.select_one(".mw-parser-output") or soup.body or soup
+    for tag in root.select("sup.reference, .mw-editsection, script, style, .toc, .navbox, table.wikitable"):
+        tag.decompose()
+    title = soup.select_one("h2.pi-title") or soup.select_one("h1")
+    name = _clean(title.get_text()) if title else url.rstrip("/").rsplit("/", 1)[-1].replace("_", " ")
+    sheet = FactSheet(url=url, name=name, infobox=_infobox(root))
+    sections = _sections(root)
+    sheet.abilities, sheet.history, sheet.trivia = sections["abilities"], sections["history"], sections["trivia"]
+    return sheet
+
+
+def record_report(report):
+    with _reports_lock:
+        _reports.append(report)
+
+
+def extraction_reports():
+    with _reports_lock:
+        return list(_reports)
@@ -0,0 +1,175 @@
+import functools
+import re
+from dataclasses import dataclass, field
+
+from onepiece_core import tools, tracing
+from onepiece_core.validate import ValidationReport, Violation, body_lines, sentences, validate_script
+
+
+TOKEN = re.compile(r"[a-z0-9]+")
+QUANTITY = re.compile(
+    r"(\d[\d,]*(?:\.\d+)?)\s*(billion|million|thousand|centimet(?:er|re)s?|cm|kilomet(?:er|re)s?|km|met(?:er|re)s?|m|feet|foot|ft)?\b",
+    re.IGNORECASE,
+)
+MULTIPLIERS = {"billion": 1e9, "million": 1e6, "thousand": 1e3}
+# Lengths in meters.
+LENGTHS = {"cm": 0.01, "centimet": 0.01, "km": 1000.0, "kilomet": 1000.0, "m": 1.0, "met": 1.0, "ft": 0.3048, "feet": 0.3048, "foot": 0.3048}
+FRUIT = re.compile(r"\b(?:[A-Z][\w'-]*\s)+no Mi\b|\b(?:[A-Z][\w'-]*[\s-])*[A-Z][\w'-]* Fruit\b")
+GENERIC_FRUITS = {"devil fruit", "the fruit"}
+# A rounded number in a script ("over 10 meters" for 10.8 m) still counts as on the page.
+TOLERANCE = 0.1
+# Small bare numbers are counts ("3 swords") that rarely come from the page; they are not checked.
+MIN_BARE_NUMBER = 10
+CITATION = re.compile(r"^\[\d+\]$")
+STOPWORDS = {"the", "a", "an", "and", "of", "in", "on", "to", "is", "was", "he", "she", "his", "her", "it", "that", "this", "with", "for", "by", "as", "at"}
+
+
+def tokens(text):
+    return TOKEN.findall(text.lower().replace("'s", ""))
+
+
+def quantities(text):
+    """``(value, dimension)`` for every number in ``text``; lengths are in meters (``"length"``),
+    everything else is a plain count (``None``)."""
+    found = []
+    for match in QUANTITY.finditer(text.replace("**", "")):
+        number, unit = match.group(1).replace(",", ""), (match.group(2) or "").lower()
+        try:
+            value = float(number)
+        except ValueError:
+            continue
+        if unit in MULTIPLIERS or not unit:
+            found.append((value * MULTIPLIERS.get(unit, 1.0), None, match.group(0).strip()))
+        else:
+            length = next(factor for prefix, factor in LENGTHS.items() if unit.startswith(prefix))
+            found.append((value * length, "length", match.group(0).strip()))
+    return found
+
+
+@dataclass
+class PageIndex:
+    """Sentences of a wiki page with an inverted index from tokens to sentences, plus every
+    number on the page."""
+
+    sentences: list = field(default_factory=list)
+    postings: dict = field(default_factory=dict)
+    quantities: list = field(default_factory=list)
+
+    @classmethod
+    def build(cls, text):
+        index = cls()
+        lines = []
+        for line in text.splitlines():
+            line = line.strip()
+            if CITATION.match(line):
+                continue
+            # Infobox labels ("Height:") come on their own line, before the value.
+            if lines and lines[-1].endswith(":") and len(lines[-1]) < 40:
+                lines[-1] = f"{lines[-1]} {line}"
+            else:
+                lines.append(line)
+        for line in lines:
+            for sentence in re.split(r"(?<=[.!?])\s+", line):
+                if not sentence:
+                    continue
+                sentence_id = len(index.sentences)
+                index.sentences.append(sentence)
+                for token in set(tokens(sentence)):
+                    index.postings.setdefault(token, set()).add(sentence_id)
+                index.quantities += [(value, dimension, sentence_id) for value, dimension, _ in quantities(sentence)]
+        return index
+
+    def has_quantity(self, value, dimension):
+        return any(
+            dimension == known_dimension and abs(value - known) <= TOLERANCE * max(abs(known), 1e-9)
+            for known, known_dimension, _ in self.quantities
+        )
+
+    def has_phrase(self, phrase):
+        """True if every word of ``phrase`` occurs in one sentence of the page."""
+        words = tokens(phrase)
+        if not words:
+            return True
+        matches = set.intersection(*(self.postings.get(word, set()) for word in words))
+        return bool(matches)
+
+    def evidence(self, text):
+        """The page sentence sharing the most content words with ``text``, or "". A sentence with a
+        length in it counts extra when ``text`` has one, so a wrong height finds the real one. The
+        title line (the page's first) is skipped. On a tie a sentence with a length wins for such a
+        ``text``, then a full sentence beats a heading, then the earlier one wins."""
+        scores = {}
+        for word in set(tokens(text)) - STOPWORDS:
+            if word.isdigit():
+                continue
+            for sentence_id in self.postings.get(word, ()):
+                scores[sentence_id] = scores.get(sentence_id, 0) + 1
+        lengths = set()
+        if any(dimension == "length" for _, dimension, _ in quantities(text)):
+            lengths = {sentence_id for _, dimension, sentence_id in self.quantities if dimension == "length"}
+            for sentence_id in lengths:
+                scores[sentence_id] = scores.get(sentence_id, 0) + 2
+        title = self.sentences[0] if self.sentences else None
+        candidates = [sentence_id for sentence_id in scores if self.sentences[sentence_id] != title]
+        if not candidates:
+            return ""
+        best = max(candidates, key=lambda sentence_id: (
+            scores[sentence_id], sentence_id in lengths, self.sentences[sentence_id].endswith((".", "!", "?")), -sentence_id,
+        ))
+        return self.sentences[best][:200]
+
+
+@functools.lru_cache(maxsize=32)
+def page_index(url):
+    # fetch_page goes through the content cache, so this reuses the page the facts stage fetched.
+    return PageIndex.build(tools.page_text(tools.fetch_page(url)))
+
+
+def unsupported_claims(line, index):
+    """Numbers and Devil Fruit names in ``line`` that are not on the page."""
+    problems = []
+    for sentence in sentences(line):
+        for value, dimension, text in quantities(sentence):
+            if dimension is None and value < MIN_BARE_NUMBER:
+                continue
+            if not index.has_quantity(value, dimension):
+                problems.append(text)
+        for fruit in FRUIT.findall(sentence.replace("**", "")):
+            if fruit.lower() not in GENERIC_FRUITS and not index.has_phrase(fruit):
+                problems.append(fruit)
+    return problems
+
+
+def ground_script(script, url):
+    """Check each line's numbers (heights, bounties, ages) and fruit names against the cached wiki
+    page, with no LLM call. Unsupported lines come back as ``grounding`` violations carrying the
+    closest page sentence, so a repair prompt can fix them without the whole page."""
+    report = ValidationReport()
+    if not url:
+        return report
+    with tracing.span("grounding", url=url) as active:
+        index = page_index(url)
+        lines = body_lines(script)
+        for number, line in lines:
+            problems = unsupported_claims(line, index)
+            if problems:
+                evidence = index.evidence(line)
+                message = f"not on the wiki page: {', '.join(problems)}"
+                if evidence:
+                    message += f"; the page says: \"{evidence}\""
+                report.violations.append(Violation("grounding", number, line, message))
+        active.set(claims=len(lines), flagged=len(report.violations))
+    return report
+
+
+def check_script(script, url=None):
+    """Format rules plus fact grounding against the wiki page at ``url``."""
+    report = validate_script(script)
+    try:
+        report.violations += ground_script(script, url).violations
+    except Exception as e:
+        # Grounding is advisory; an unreachable page must not block the format check.
+        active = tracing.current_span()
+        if active is not None:
+            active.set(grounding_error=f"{type(e).__name__}: {e}")
+    return report
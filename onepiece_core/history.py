@@ -0,0 +1,220 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from onepiece_core.cache import cache_dir
+
+
+DIMENSIONS = 1024
+DUPLICATE_THRESHOLD = 0.8
+# Fact-sheet lines that identify the subject; generic fields (status, debut, age) are left out so
+# two unrelated characters from the same crew do not look alike.
+FINGERPRINT_FIELDS = ("Height", "Devil Fruit", "Devil Fruit (English)", "Bounty")
+FINGERPRINT_SECTIONS = ("Abilities", "Trivia")
+HEADER_NUMBER = re.compile(r"^(\s*\*\*\s*SHORT\s*)(?:\[?#\]?|\d+)(\s*:)", re.IGNORECASE)
+TOKEN = re.compile(r"[a-z0-9]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scripts (
+    number INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    url TEXT NOT NULL,
+    facts TEXT NOT NULL,
+    script TEXT NOT NULL,
+    created REAL NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scripts_url ON scripts (url);
+"""
+
+
+class DuplicateTopicError(ValueError):
+    pass
+
+
+@dataclass
+class HistoryEntry:
+    number: int
+    topic: str
+    url: str
+    facts: str
+    script: str
+    created: float
+
+
+def history_path():
+    return os.environ.get("ONEPIECE_HISTORY_DB") or os.path.join(cache_dir(), "history.sqlite")
+
+
+def first_number():
+    # Numbering continues an existing series when the channel already published shorts.
+    return int(os.environ.get("ONEPIECE_FIRST_SHORT_NUMBER", "1"))
+
+
+def fingerprint(facts):
+    """The identifying part of a rendered fact sheet: name, fruit, height, bounty, abilities and trivia."""
+    lines = []
+    section = None
+    for line in facts.splitlines():
+        if line.startswith("# "):
+            lines += [line[2:]] * 3
+        elif line.startswith("## "):
+            section = line[3:].strip()
+        elif line.startswith("- ") and section is None:
+            label, _, value = line[2:].partition(": ")
+            if label in FINGERPRINT_FIELDS:
+                lines.append(value)
+        elif section in FINGERPRINT_SECTIONS and not line.startswith("#"):
+            lines.append(line.lstrip("- "))
+    return "\n".join(lines) if lines else facts[:2000]
+
+
+def embed(text):
+    """L2-normalised hashed bag of word unigrams and bigrams (sublinear tf)."""
+    tokens = TOKEN.findall(text.lower())
+    counts = {}
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % DIMENSIONS
+        sign = 1.0 if digest[4] & 1 else -1.0
+        counts[index] = counts.get(index, 0.0) + sign
+    vector = array("f", bytes(4 * DIMENSIONS))
+    for index, count in counts.items():
+        vector[index] = math.copysign(1 + math.log(abs(count)), count) if count else 0.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    for index in counts:
+        vector[index] /= norm
+    return vector
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def number_script(script, number):
+    """Put ``number`` into the ``**SHORT [#]: ...**`` header, whatever placeholder the writer left."""
+    lines = script.split("\n")
+    for index, line in enumerate(lines):
+        if line.strip():
+            lines[index] = HEADER_NUMBER.sub(lambda m: f"{m.group(1)}{number}{m.group(2)}", line, count=1)
+            break
+    return "\n".join(lines)
+
+
+class ScriptHistory:
+    """Every published script with its topic, wiki URL and key facts, plus a hashed n-gram vector
+    of those facts for near-duplicate lookups. Small enough to scan in memory."""
+
+    def __init__(self, path=None):
+        self.path = path or history_path()
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._script_vectors = {}
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _load_vectors(self):
+        if self._vectors is None:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT number, topic, url, vector FROM scripts").fetchall()
+            self._vectors = [(number, topic, url, array("f", blob)) for number, topic, url, blob in rows]
+        return self._vectors
+
+    def find_duplicate(self, url, facts, threshold=DUPLICATE_THRESHOLD):
+        """``(number, topic, similarity)`` of the closest earlier script, if the URL matches or the
+        facts are at least ``threshold`` similar; otherwise None."""
+        with self._lock:
+            vectors = self._load_vectors()
+        best = None
+        query = embed(fingerprint(facts))
+        for number, topic, known_url, vector in vectors:
+            similarity = 1.0 if known_url == url else cosine(query, vector)
+            if similarity >= threshold and (best is None or similarity > best[2]):
+                best = (number, topic, similarity)
+        return best
+
+    def ensure_new_topic(self, url, facts, threshold=DUPLICATE_THRESHOLD):
+        duplicate = self.find_duplicate(url, facts, threshold)
+        if duplicate is not None:
+            number, topic, similarity = duplicate
+            raise DuplicateTopicError(f"already covered in SHORT {number} ({topic}, similarity {similarity:.2f})")
+
+    def add(self, topic, url, facts, script):
+        """Store a finished script under the next SHORT number and return the numbered entry."""
+        vector = embed(fingerprint(facts))
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            number = conn.execute("SELECT COALESCE(MAX(number) + 1, ?) FROM scripts", (first_number(),)).fetchone()[0]
+            script = number_script(script, number)
+            created = time.time()
+            conn.execute(
+                "INSERT INTO scripts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (number, topic, url, facts, script, created, vector.tobytes()),
+            )
+            if self._vectors is not None:
+                self._vectors.append((number, topic, url, vector))
+        return HistoryEntry(number, topic, url, facts, script, created)
+
+    def replace_script(self, number, script):
+        """Swap in a regenerated script for SHORT ``number``, keeping its topic, URL and number."""
+        script = number_script(script, number)
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE scripts SET script = ? WHERE number = ?", (script, number))
+            self._script_vectors.pop(number, None)
+            row = conn.execute("SELECT number, topic, url, facts, script, created FROM scripts WHERE number = ?", (number,)).fetchone()
+        if row is None:
+            raise KeyError(f"no SHORT {number} in the history")
+        return HistoryEntry(*row)
+
+    def script_similarity(self, script, limit=50):
+        """Highest similarity between ``script`` and the last ``limit`` published scripts, 0 if none."""
+        entries = self.recent(limit)
+        with self._lock:
+            for entry in entries:
+                if entry.number not in self._script_vectors:
+                    self._script_vectors[entry.number] = embed(entry.script)
+            vectors = [self._script_vectors[entry.number] for entry in entries]
+        query = embed(script)
+        return max((cosine(query, vector) for vector in vectors), default=0.0)
+
+    def recent(self, limit=10):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT number, topic, url, facts, script, created FROM scripts ORDER BY number DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def covered_urls(self):
+        with self._lock:
+            return {url for _, _, url, _ in self._load_vectors()}
+
+    def covered_topics(self, limit=30):
+        with self._lock:
+            return [topic for _, topic, _, _ in self._load_vectors()[-limit:]]
+
+    def next_number(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(number) + 1, ?) FROM scripts", (first_number(),)).fetchone()[0]
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    global _history
+    with _history_lock:
+        if _history is None or _history.path != history_path():
+            _history = ScriptHistory()
+        return _history
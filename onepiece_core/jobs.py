@@ -0,0 +1,312 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from onepiece_core import scheduler
+from onepiece_core.backends import BACKENDS, ScriptResult, direct_stage_fns
+from onepiece_core.cache import cache_dir
+from onepiece_core.history import get_history
+from onepiece_core.memo import drop_outputs
+from onepiece_core.pipeline import PipelineJob, run_stages
+
+
+DEFAULT_WORKERS = 2
+# How often idle workers look for jobs queued by another process sharing the database.
+POLL_SECONDS = 1.0
+# queued -> running -> ok | duplicate | error; a running job whose process died becomes interrupted.
+FINISHED = ("ok", "duplicate", "error")
+RESUMABLE = ("error", "interrupted")
+# A saved script keeps its topic and URL, so only stages after the fact sheet can be rerun in place:
+# a new search may pick another character, and the duplicate check would reject the script's own page.
+SAVED_REGENERABLE = ("write", "edit", "voiceover")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    request TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    state TEXT NOT NULL DEFAULT '{}',
+    timings TEXT NOT NULL DEFAULT '{}',
+    usage TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    trace_id TEXT,
+    owner INTEGER,
+    session TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+"""
+
+
+def jobs_path():
+    return os.environ.get("ONEPIECE_JOBS_DB") or os.path.join(cache_dir(), "jobs.sqlite")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class Job:
+    id: str
+    request: str
+    backend: str
+    options: dict
+    status: str
+    stage: str = None
+    state: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    usage: dict = field(default_factory=dict)
+    result: dict = None
+    error: str = None
+    trace_id: str = None
+    created: float = 0.0
+    updated: float = 0.0
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    @property
+    def completed_stages(self):
+        return list(self.timings)
+
+    @property
+    def saved_number(self):
+        return (self.result or {}).get("number") if self.status == "ok" else None
+
+    @property
+    def regenerable_stages(self):
+        """Completed stages ``JobQueue.regenerate`` can start from."""
+        if self.saved_number is None:
+            return self.completed_stages
+        return [stage for stage in self.completed_stages if stage in SAVED_REGENERABLE]
+
+
+class JobQueue:
+    """SQLite-backed queue of direct-pipeline runs with a pool of worker threads.
+
+    Every finished stage is written back with its outputs, so a job that failed or whose process
+    died can be resumed from the next stage. API keys are never stored: they are kept in memory
+    for queued jobs, and ``resume`` has to be given them again. Free workers take the oldest job of
+    the session with the fewest running jobs, so one session queueing many jobs does not hold up
+    the others.
+    """
+
+    def __init__(self, path=None, workers=DEFAULT_WORKERS):
+        self.path = path or jobs_path()
+        self.workers = workers
+        self._credentials = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._threads = []
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            if "session" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN session TEXT")
+            # Jobs left running (or queued, with their keys gone) by a process that no longer exists.
+            owners = [row[0] for row in conn.execute("SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')")]
+            for owner in owners:
+                if owner != os.getpid() and (owner is None or not _alive(owner)):
+                    conn.execute(
+                        "UPDATE jobs SET status = 'interrupted', updated = ? WHERE owner IS ? AND status IN ('queued', 'running')",
+                        (time.time(), owner),
+                    )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _start_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"onepiece-job-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, request, backend, openai_api_key, search_api_key, quality_pass=False, variants=1, session_id=scheduler.DEFAULT_SESSION):
+        """Queue a run for ``session_id`` and return its job ID; a worker picks it up as soon as one
+        is free and it is the session's turn."""
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}")
+        options = {"quality_pass": quality_pass, "variants": variants}
+        return self._insert(request, backend, options, self._session(session_id, backend, openai_api_key, search_api_key))
+
+    @staticmethod
+    def _session(session_id, backend, openai_api_key, search_api_key):
+        return scheduler.Session(session_id, openai_api_key, search_api_key, BACKENDS[backend].search_provider)
+
+    def regenerate(self, job_id, stage, openai_api_key, search_api_key, session_id=scheduler.DEFAULT_SESSION):
+        """Queue a new job that reuses ``job_id``'s outputs before ``stage`` and runs ``stage`` and
+        everything after it again, skipping their memoized outputs. Returns the new job ID. If the
+        source script was saved, the new script replaces it under the same SHORT number, so only
+        ``SAVED_REGENERABLE`` stages are allowed."""
+        source = self.get(job_id)
+        if source is None or stage not in source.completed_stages:
+            raise ValueError(f"job {job_id} has no completed {stage} stage")
+        if stage not in source.regenerable_stages:
+            raise ValueError(f"job {job_id} was saved as SHORT {source.saved_number}; regenerate from {', '.join(SAVED_REGENERABLE)}")
+        kept = source.completed_stages[:source.completed_stages.index(stage)]
+        options = {**source.options, "refresh_from": stage}
+        if source.saved_number is not None:
+            options["replaces"] = source.saved_number
+        return self._insert(
+            source.request, source.backend, options, self._session(session_id, source.backend, openai_api_key, search_api_key),
+            state=drop_outputs(source.state, stage, source.completed_stages),
+            # Reused stages cost this job nothing; they only have to count as completed.
+            timings=dict.fromkeys(kept, 0.0),
+        )
+
+    def _insert(self, request, backend, options, session, state=None, timings=None, usage=None):
+        job_id = secrets.token_hex(8)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, request, backend, options, status, state, timings, usage, owner, session, created, updated) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, request, backend, json.dumps(options), json.dumps(state or {}), json.dumps(timings or {}),
+                 json.dumps(usage or {}), os.getpid(), session.id, now, now),
+            )
+        self._enqueue(job_id, session)
+        return job_id
+
+    def resume(self, job_id, openai_api_key, search_api_key, session_id=scheduler.DEFAULT_SESSION):
+        """Queue a failed or interrupted job again; it continues after its last completed stage."""
+        job = self.get(job_id)
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = 'queued', error = NULL, owner = ?, session = ?, updated = ? WHERE id = ? AND status IN (?, ?)",
+                (os.getpid(), session_id, time.time(), job_id, *RESUMABLE),
+            ).rowcount
+        if not updated:
+            raise ValueError(f"job {job_id} is not resumable")
+        self._enqueue(job_id, self._session(session_id, job.backend, openai_api_key, search_api_key))
+
+    def _enqueue(self, job_id, session):
+        with self._wakeup:
+            self._credentials[job_id] = session
+            self._wakeup.notify()
+        self._start_workers()
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, request, backend, options, status, stage, state, timings, usage, result, error, trace_id, created, updated "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return self._job(row) if row is not None else None
+
+    def recent(self, limit=10):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, request, backend, options, status, stage, state, timings, usage, result, error, trace_id, created, updated "
+                "FROM jobs ORDER BY created DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    @staticmethod
+    def _job(row):
+        (job_id, request, backend, options, status, stage, state, timings, usage, result, error, trace_id, created, updated) = row
+        return Job(
+            job_id, request, backend, json.loads(options), status, stage, json.loads(state), json.loads(timings),
+            json.loads(usage), json.loads(result) if result else None, error, trace_id, created, updated,
+        )
+
+    def _claim(self):
+        """Mark a queued job this process holds keys for as running and return it: the oldest one of
+        the session with the fewest running jobs."""
+        with self._wakeup:
+            while True:
+                pending = list(self._credentials)
+                if pending:
+                    with self._connect() as conn:
+                        placeholders = ", ".join("?" * len(pending))
+                        for (job_id,) in conn.execute(
+                            f"SELECT id FROM jobs AS queued WHERE status = 'queued' AND id IN ({placeholders}) "
+                            "ORDER BY (SELECT COUNT(*) FROM jobs WHERE status = 'running' AND session IS queued.session), created",
+                            pending,
+                        ).fetchall():
+                            claimed = conn.execute(
+                                "UPDATE jobs SET status = 'running', owner = ?, updated = ? WHERE id = ? AND status = 'queued'",
+                                (os.getpid(), time.time(), job_id),
+                            ).rowcount
+                            if claimed:
+                                return job_id, self._credentials.pop(job_id)
+                self._wakeup.wait(POLL_SECONDS)
+
+    def _work(self):
+        while True:
+            job_id, session = self._claim()
+            try:
+                with scheduler.use_session(session):
+                    self._run(self.get(job_id), session.openai_api_key, session.search_api_key)
+            except Exception as e:
+                self._update(job_id, status="error", error=f"{type(e).__name__}: {e}")
+
+    def _update(self, job_id, **columns):
+        columns["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        values = [json.dumps(value) if isinstance(value, dict) else value for value in columns.values()]
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values, job_id))
+
+    def _run(self, row, openai_api_key, search_api_key):
+        options = dict(row.options)
+        replaces = options.pop("replaces", None)
+        stage_fns = direct_stage_fns(row.backend, openai_api_key, search_api_key, **options)
+        job = PipelineJob(row.request, state=dict(row.state), timings=dict(row.timings), usage=dict(row.usage))
+
+        def stage_done(name, job):
+            self._update(row.id, state=job.state, timings=job.timings, usage=job.usage)
+
+        job = run_stages(
+            stage_fns, row.request, job=job,
+            on_stage=lambda name: self._update(row.id, stage=name),
+            on_stage_done=stage_done,
+            backend=row.backend, mode="job", model=BACKENDS[row.backend].model_id, job_id=row.id,
+            **({"resumed_after": row.completed_stages[-1]} if row.completed_stages else {}),
+        )
+        result = ScriptResult.from_job(job, row.backend)
+        if replaces is not None and result.ok:
+            entry = get_history().replace_script(replaces, result.script)
+            result.number, result.script = entry.number, entry.script
+        else:
+            result.save(job.state.get("facts"))
+        # A failed stage's output is not kept and ``stage`` still names it, so resuming starts there.
+        finished = {"status": result.status, "error": result.error, "result": result.to_dict(), "trace_id": job.trace_id}
+        if result.status != "error":
+            finished["stage"] = None
+        self._update(row.id, **finished)
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_jobs():
+    """The process-wide job queue; ``ONEPIECE_JOB_WORKERS`` sets the number of worker threads."""
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None or _jobs.path != jobs_path():
+            _jobs = JobQueue(workers=int(os.environ.get("ONEPIECE_JOB_WORKERS", DEFAULT_WORKERS)))
+        return _jobs
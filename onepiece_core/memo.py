@@ -0,0 +1,85 @@
+import hashlib
+import json
+
+from onepiece_core import prompts, tools
+from onepiece_core.cache import get_cache
+from onepiece_core.validate import RULES
+
+
+# State keys each LLM stage reads, and the run options that change its output. The facts stage is
+# not memoized: its page is already in the content cache, and it has to repeat the duplicate check.
+STAGE_INPUTS = {
+    "search": ("request",),
+    "write": ("url", "facts"),
+    "edit": ("draft", "facts", "url"),
+}
+STAGE_OPTIONS = {
+    "write": ("variants",),
+    "edit": ("quality_pass",),
+}
+# State keys each stage adds, so a regenerated run can drop everything from a stage onwards.
+STAGE_OUTPUTS = {
+    "search": ("research", "url"),
+    "facts": ("facts",),
+    "write": ("draft", "draft_scores"),
+    "edit": ("script", "violations", "draft_violations"),
+    "voiceover": ("voiceover",),
+}
+
+
+def stage_key(stage, state, backend, model, options=None):
+    """Digest of everything a stage's output depends on: its inputs, backend, routed model,
+    options and prompt version."""
+    inputs = {name: state.get(name) for name in STAGE_INPUTS[stage]}
+    if stage == "search":
+        # Part of the searcher's prompt, and it changes whenever a script is saved.
+        inputs["hint"] = tools.covered_topics_hint()
+    if stage == "edit":
+        inputs["rules"] = RULES
+    payload = {
+        "stage": stage,
+        "backend": backend,
+        "model": model,
+        "prompts": prompts.prompt_version(stage),
+        "options": {name: (options or {}).get(name) for name in STAGE_OPTIONS.get(stage, ())},
+        "inputs": inputs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def memoize(stage, fn, backend, model, options=None, refresh=False):
+    """Wrap a stage function so its output is reused when the same inputs come back. With
+    ``refresh`` the stage always runs and its new output replaces the stored one."""
+    if stage not in STAGE_INPUTS:
+        return fn
+
+    def run(state):
+        if stage == "search" and not (state.get("request") or "").strip():
+            # With no topic the searcher picks one; a stored pick could be one the facts stage
+            # rejects as a near-duplicate, and every retry would get the same URL back.
+            return fn(state)
+        key = stage_key(stage, state, backend, model, options)
+        if not refresh:
+            body = get_cache().get("stage", key)
+            if body is not None:
+                output = json.loads(body)
+                output["usage"] = {"model": model, "llm_calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "memoized": 1}
+                return output
+        output = fn(state)
+        get_cache().put("stage", key, json.dumps(output, ensure_ascii=False))
+        return output
+
+    return run
+
+
+def memoize_stages(stage_fns, backend, router, options=None, refresh_from=None):
+    """``memoize`` every ``(name, fn)`` stage; stages from ``refresh_from`` onwards always run."""
+    names = [name for name, _ in stage_fns]
+    refreshed = set(names[names.index(refresh_from):]) if refresh_from else set()
+    return [(name, memoize(name, fn, backend, router.model(name), options, name in refreshed)) for name, fn in stage_fns]
+
+
+def drop_outputs(state, stage, stages):
+    """``state`` without the outputs of ``stage`` and every stage after it in ``stages``."""
+    dropped = {key for name in stages[stages.index(stage):] for key in STAGE_OUTPUTS.get(name, ())}
+    return {key: value for key, value in state.items() if key not in dropped}
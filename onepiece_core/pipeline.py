@@ -0,0 +1,173 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from onepiece_core import tracing
+
+
+@dataclass
+class Stage:
+    """One step of the searcher → writer → editor pipeline.
+
+    ``make_fn`` is called once per worker (in a worker thread) and returns the blocking function
+    that worker runs; that way every worker owns its agents and never shares them across threads.
+    The returned function receives the job state dict and returns the keys it adds; an optional
+    ``usage`` key (LLM calls and tokens for the stage) is moved into ``PipelineJob.usage``.
+    """
+
+    name: str
+    make_fn: object
+    workers: int = 1
+
+
+@dataclass
+class PipelineJob:
+    request: str
+    state: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    usage: dict = field(default_factory=dict)
+    error: str = None
+    exception: Exception = None
+    span: tracing.Span = None
+
+    def __post_init__(self):
+        self.state.setdefault("request", self.request)
+
+    def start_trace(self, **attributes):
+        self.span = tracing.start_span("pipeline", request=self.request, **attributes)
+
+    def end_trace(self):
+        if self.span is not None:
+            self.span.error = self.error
+            tracing.end_span(self.span)
+
+    @property
+    def trace_id(self):
+        return self.span.trace_id if self.span is not None else None
+
+    def breakdown(self):
+        return [
+            {"stage": name, "seconds": round(seconds, 2), **self.usage.get(name, {})}
+            for name, seconds in self.timings.items()
+        ]
+
+
+def run_stage(name, fn, job):
+    started = time.perf_counter()
+    # The parent is passed explicitly: stages run in executor threads, which do not inherit the
+    # caller's current span.
+    stage_span = tracing.start_span(f"stage.{name}", parent=job.span, stage=name)
+    token = tracing.activate(stage_span)
+    try:
+        output = dict(fn(job.state))
+        if "usage" in output:
+            job.usage[name] = output.pop("usage")
+            stage_span.set(**job.usage[name])
+        job.state.update(output)
+    except Exception as e:
+        job.error = f"{name}: {type(e).__name__}: {e}"
+        job.exception = e
+        stage_span.error = f"{type(e).__name__}: {e}"
+    finally:
+        tracing.deactivate(token)
+    tracing.end_span(stage_span)
+    job.timings[name] = time.perf_counter() - started
+
+
+def fan_out(fn, count):
+    """Call ``fn(0)`` ... ``fn(count - 1)`` in parallel threads under the current span and return the
+    results that succeeded, in order. Raises the first error only if every call failed."""
+    if count == 1:
+        return [fn(0)]
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        # Each call gets its own copy of the context, so LLM spans land under the calling stage.
+        futures = [pool.submit(contextvars.copy_context().run, fn, index) for index in range(count)]
+    results, errors = [], []
+    for future in futures:
+        if future.exception() is None:
+            results.append(future.result())
+        else:
+            errors.append(future.exception())
+    if not results:
+        raise errors[0]
+    active = tracing.current_span()
+    if errors and active is not None:
+        active.add("failed_calls", len(errors))
+    return results
+
+
+def run_stages(stage_fns, request, on_stage=None, job=None, on_stage_done=None, **trace_attributes):
+    """Run ``(name, fn)`` stages one after another in the calling thread. A ``job`` whose timings
+    already list some stages is resumed after them; ``on_stage_done(name, job)`` runs after every
+    stage that succeeds."""
+    job = job or PipelineJob(request)
+    job.start_trace(**trace_attributes)
+    for name, fn in stage_fns:
+        if name in job.timings:
+            continue
+        if on_stage is not None:
+            on_stage(name)
+        run_stage(name, fn, job)
+        if job.error is not None:
+            break
+        if on_stage_done is not None:
+            on_stage_done(name, job)
+    job.end_trace()
+    return job
+
+
+class AsyncPipeline:
+    """Runs jobs through the stages with bounded queues between them.
+
+    Each stage works on a different job at the same time, so while the writer drafts topic A
+    the searcher is already looking up topic B. A failed job skips the remaining stages and
+    comes out with ``error`` set.
+    """
+
+    def __init__(self, stages, queue_size=2, trace_attributes=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.trace_attributes = trace_attributes or {}
+
+    async def run(self, requests, on_result=None):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=sum(stage.workers for stage in self.stages))
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        async def feed():
+            for request in requests:
+                job = PipelineJob(request)
+                job.start_trace(**self.trace_attributes)
+                await queues[0].put(job)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(None)
+
+        async def stage_loop(index, stage):
+            async def worker():
+                fn = await loop.run_in_executor(executor, stage.make_fn)
+                while (job := await queues[index].get()) is not None:
+                    if job.error is None:
+                        await loop.run_in_executor(executor, run_stage, stage.name, fn, job)
+                    await queues[index + 1].put(job)
+
+            await asyncio.gather(*(worker() for _ in range(stage.workers)))
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(next_workers):
+                await queues[index + 1].put(None)
+
+        async def drain():
+            jobs = []
+            while (job := await queues[-1].get()) is not None:
+                job.end_trace()
+                jobs.append(job)
+                if on_result is not None:
+                    on_result(job)
+            return jobs
+
+        try:
+            *_, jobs = await asyncio.gather(feed(), *(stage_loop(i, s) for i, s in enumerate(self.stages)), drain())
+        finally:
+            executor.shutdown(wait=False)
+        return jobs
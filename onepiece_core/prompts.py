@@ -0,0 +1,404 @@
+import hashlib
+from dataclasses import dataclass
+from textwrap import dedent
+
+from onepiece_core.validate import RULES
+
+
+# Prompt text shared by the agno and crewai backends, and the sidebar copy of the app. Everything
+# here is plain strings so batch workers can build prompts without importing a framework.
+
+
+@dataclass(frozen=True)
+class Role:
+    """One agent role. agno uses ``name``, ``goal`` (its role line) and ``backstory`` (its
+    description); crewai uses ``title`` as the role, ``goal`` and ``backstory``."""
+
+    name: str
+    title: str
+    goal: str
+    backstory: str
+
+
+SEARCHER = Role(
+    name="OnePieceTopicSearcher",
+    title="One Piece Topic Researcher",
+    goal="Searches for hookable One Piece topics about unfamiliar abilities and hidden stories",
+    backstory=dedent(
+        """\
+        You are a One Piece expert and viral content researcher. Your job is to find the most
+        intriguing, lesser-known facts about One Piece characters, their abilities, and hidden stories
+        that would make viewers stop scrolling and watch a YouTube short.
+        """
+    ),
+)
+WRITER = Role(
+    name="OnePieceScriptWriter",
+    title="Viral YouTube Shorts Script Writer",
+    goal="Writes highly engaging One Piece YouTube Shorts scripts using dramatic contrast, humor, and specific lore facts",
+    backstory=dedent(
+        """\
+        You are a viral YouTube Shorts scriptwriter specializing in One Piece content.
+        You write dramatic, funny, and hook-driven scripts using short punchy lines and real canon details.
+        Your job is to turn wiki pages into 60-second script gold.
+        """
+    ),
+)
+EDITOR = Role(
+    name="ScriptEditor",
+    title="Content Editor and Quality Assurance",
+    goal="Edits and polishes One Piece YouTube shorts scripts for maximum engagement",
+    backstory=dedent(
+        """\
+        You are a YouTube shorts content editor specializing in One Piece viral content.
+        Your job is to ensure scripts are grammatically perfect, engaging, and optimized for retention.
+        """
+    ),
+)
+REPAIRER = Role(
+    name="ScriptRepairer",
+    title="Script Format Repairer",
+    goal="Fixes format rule violations in One Piece YouTube shorts scripts",
+    backstory="You rewrite flagged script lines so they follow the format rules, keeping the facts.",
+)
+
+SEARCH_GUIDELINES = [
+    "Search for ONE specific One Piece character or topic at a time to avoid token limits.",
+    "Use targeted searches like: 'site:onepiece.fandom.com [specific character name]' or 'site:onepiece.fandom.com [specific devil fruit]'",
+    "Focus on finding ONE compelling character page that has surprising or lesser-known information.",
+    "Look for characters with unusual abilities, hidden backstories, or surprising connections.",
+    "Prioritize characters that have surprising size comparisons, hidden powers, or unexpected backstories.",
+    "Examples of good targets: Sanjuan Wolf, Gedatsu, Shiki, lesser-known giants, characters with unusual devil fruits.",
+    "When results include a surprise score, prefer pages with a high score (extreme height, rare devil fruit, few inbound links).",
+]
+SEARCH_RESULT = [
+    "ONE specific One Piece Wiki URL",
+    "Brief explanation of why this character/topic is compelling for a viral short",
+    "Key surprising facts that make this worth covering",
+]
+
+SCRIPT_STRUCTURE = [
+    "**SHORT [#]: [CATCHY TITLE]**",
+    "",
+    "[Start with a common belief]",
+    "",
+    "But [twist or contradiction].",
+    "",
+    "**[Character Name]** [main trait or reveal].",
+    "",
+    "[3–5 short facts, each on its own line]",
+    "",
+    "[Final twist, cliffhanger, or surprise that makes the viewer want more]",
+]
+# The format rules come from the validator, so drafts are written against the same rules they are
+# checked with.
+SCRIPT_RULES = [
+    *RULES,
+    "Must sound like a YouTube narrator—not a wiki.",
+    "Be dramatic, funny, or surprising.",
+    "End on a punchline, mystery, or big twist.",
+]
+# The writer copies these, so each one passes validate.RULES (checked in tests/test_prompts.py).
+STYLE_EXAMPLES = [
+    "**SHORT 27: The BIGGEST Character in One Piece**",
+    "",
+    "Wadatsumi is huge, even for a One Piece giant...",
+    "",
+    "But this guy towers over him by 300 feet.",
+    "",
+    "**Sanjuan Wolf** is not your ordinary giant.",
+    "",
+    "He also ate the Deka Deka no Mi...",
+    "",
+    "...making him the tallest character in One Piece.",
+    "",
+    "He's even bigger than the Statue of Liberty.",
+    "",
+    "He's nearly half the height of the Eiffel Tower.",
+    "",
+    "On the burning island, he stood in the ocean.",
+    "",
+    "The sea weakens him, but he didn't drown.",
+    "",
+    "The water just can't reach his head.",
+    "",
+    "And here's the twist.",
+    "",
+    "Its opposite, the Mini Mini no Mi...",
+    "",
+    "...went to another giant named **Lily**.",
+    "",
+    "That makes her the smallest giant in One Piece.",
+    "",
+    "---",
+    "",
+    "**SHORT 23: The most beautiful woman in One Piece**",
+    "",
+    "**Boa Hancock** is One Piece's most beautiful woman.",
+    "",
+    "But 38 years ago, **Gloriosa** held that title.",
+    "",
+    "She's old and short now.",
+    "",
+    "Yet she was once the Pirate Empress.",
+    "",
+    "She ruled three generations before **Hancock**.",
+    "",
+    "Then she left her kingdom out of lovesickness.",
+    "",
+    "She followed the strongest man she ever met.",
+    "",
+    "He sailed with the legendary **Rocks Pirates**.",
+    "",
+    "That man... might be **Kaido**.",
+    "",
+    "**Yamato's** mother is one of One Piece's biggest mysteries.",
+    "",
+    "But **Oda** hinted at it on Amazon Lily.",
+    "",
+    "**Luffy** showed **Ace's** vivre card to the Kuja.",
+    "",
+    "**Yamato** made that card and gave it to **Ace**.",
+    "",
+    "And **Gloriosa** knew all about vivre cards.",
+    "",
+    "Maybe because her own son mastered the technique.",
+    "",
+    "---",
+    "",
+    "**SHORT 22: The Dumbest Character in One Piece**",
+    "",
+    "**Luffy** might be the dumbest captain in One Piece...",
+    "",
+    "But the dumbest character overall?",
+    "",
+    "**Luffy** is Einstein compared to this guy.",
+    "",
+    "And that guy is **Gedatsu**.",
+    "",
+    "**Gedatsu** is so dumb he forgets to breathe.",
+    "",
+    "He rolls his eyes back until he can't see...",
+    "",
+    "Then he wonders why the world went dark.",
+    "",
+    "But wait, it gets worse.",
+    "",
+    "He once climbed in through a window...",
+    "",
+    "...while the door stood wide open next to him.",
+    "",
+    "He puts food in his ears at dinner.",
+    "",
+    "And here's my favorite.",
+    "",
+    "**Gedatsu** once aimed his attack at an ally.",
+    "",
+    "Yes, **Luffy** is an idiot.",
+    "",
+    "But at least he remembers to breathe.",
+    "",
+    "**Gedatsu** has to remind himself to do it.",
+]
+# Opening lines of the examples, for prompts that should stay short.
+STYLE_EXCERPTS = [
+    "Wadatsumi is huge, even for a One Piece giant... But this guy towers over him by 300 feet.",
+    "**Boa Hancock** is One Piece's most beautiful woman. But 38 years ago, **Gloriosa** held that title.",
+    "**Luffy** might be the dumbest captain in One Piece... But the dumbest character overall?",
+]
+
+EDITING_CHECKLIST = [
+    "Grammar & Flow:",
+    "- Perfect grammar and punctuation",
+    "- Smooth transitions between sentences",
+    "- Consistent tense throughout",
+    "- Proper capitalization of character names and abilities",
+    "",
+    "Engagement Optimization:",
+    "- Ensure the hook is compelling and creates curiosity",
+    "- Verify all facts are accurate to the wiki page",
+    "- Check that the script builds suspense effectively",
+    "- Confirm the ending provides a satisfying revelation",
+    "",
+    "Technical Requirements:",
+    *(f"- {rule}" for rule in RULES),
+    "",
+    "Content Quality:",
+    "- Information is accurate and verifiable from the specific wiki page",
+    "- Topic is genuinely surprising or lesser-known",
+    "- Script follows the proven viral format from examples",
+    "- Ending creates desire to watch more content",
+    "- All facts are sourced from the official wiki content",
+]
+
+# Instruction lists (agno agents).
+SEARCHER_INSTRUCTIONS = [
+    *SEARCH_GUIDELINES,
+    "From search results, select the SINGLE most promising One Piece Wiki character page URL.",
+    "Avoid general searches - be specific about one character or ability.",
+    "Return only ONE wiki URL with a brief explanation of why it's compelling for a viral short.",
+]
+WRITER_INSTRUCTIONS = [
+    "You will receive ONE specific One Piece Wiki URL from the topic searcher.",
+    "Use `read_website()` to get the page's fact sheet (infobox, abilities, history, trivia) and pick the most surprising details — especially abilities, sizes, fruits, ranks, and backstories.",
+    "",
+    "Follow this structure *exactly*:",
+    "",
+    *SCRIPT_STRUCTURE,
+    "",
+    "⚠️ RULES TO FOLLOW:",
+    *(f"- {rule}" for rule in SCRIPT_RULES),
+    "",
+    "✅ EXACT STYLE EXAMPLES TO FOLLOW:",
+    "",
+    *STYLE_EXAMPLES,
+]
+TEAM_EDITOR_INSTRUCTIONS = [
+    "Ask the topic searcher to find ONE specific One Piece Wiki page about a character with surprising abilities or hidden stories.",
+    "Then, provide the single wiki URL to the script writer to create a viral short script.",
+    "Finally, edit the script for:",
+    "",
+    *EDITING_CHECKLIST,
+]
+STAGE_EDITOR_INSTRUCTIONS = [
+    "Edit the script you are given for:",
+    "",
+    *EDITING_CHECKLIST,
+    "",
+    "Return only the final script.",
+]
+REPAIRER_INSTRUCTIONS = [
+    "Rewrite only the lines you are given so they follow the rules.",
+    "Answer in the requested `<number>: <text>` format and nothing else.",
+]
+
+
+def _bullets(lines):
+    return "\n".join(f"- {line}" for line in lines)
+
+
+# Task descriptions (crewai tasks).
+RESEARCH_TASK = (
+    "Search for ONE specific One Piece character or topic that would make viewers stop scrolling.\n\n"
+    f"Instructions:\n{_bullets(SEARCH_GUIDELINES[1:])}\n\n"
+    f"Return:\n{_bullets(SEARCH_RESULT)}\n"
+)
+WRITING_TASK = (
+    "Using the One Piece Wiki URL provided, create a viral YouTube Shorts script.\n\n"
+    "Process:\n"
+    "1. Read the wiki page's fact sheet using the read website content tool\n"
+    "2. Pick the most surprising and engaging facts\n"
+    "3. Write a script following the EXACT format below\n\n"
+    "FORMAT TO FOLLOW EXACTLY:\n\n" + "\n".join(SCRIPT_STRUCTURE) + "\n\n"
+    f"STRICT RULES:\n{_bullets(SCRIPT_RULES)}\n\n"
+    "Study these examples for style:\n" + _bullets(f'"{excerpt}"' for excerpt in STYLE_EXCERPTS) + "\n"
+)
+EDITING_TASK = (
+    "Edit and polish the YouTube Shorts script for maximum engagement.\n\n"
+    "Check for:\n\n" + "\n".join(EDITING_CHECKLIST) + "\n\n"
+    "Return the final polished script ready for recording.\n"
+)
+
+
+# Different openings for parallel drafts of the same fact sheet, so the ranker has real choices.
+WRITER_ANGLES = (
+    "",
+    "Open with the single most surprising number on the fact sheet.",
+    "Open with a question the viewer cannot answer yet.",
+    "Open with the contrast between how the character looks and what they can do.",
+    "Open by comparing the character to someone every fan knows.",
+)
+
+
+def research_query(user_request="", hint=""):
+    """The searcher's request; ``hint`` (topics to skip) goes last so the prompt prefix stays cacheable."""
+    if user_request:
+        query = f"Find ONE specific One Piece Wiki character page about {user_request} that has surprising abilities or hidden stories perfect for a viral YouTube short"
+    else:
+        query = "Find ONE compelling One Piece Wiki character page with lesser-known facts, unfamiliar abilities, or hidden stories that would make a viral YouTube short"
+    return f"{query}\n{hint}" if hint else query
+
+
+def writing_request(url, facts, angle=""):
+    return (
+        f"Wiki page: {url}\n\n"
+        "Fact sheet (already read with `read_website()`, do not read the page again):\n"
+        f"{facts}\n\n"
+        + (f"Angle: {angle}\n\n" if angle else "")
+        + "Write the short."
+    )
+
+
+def writer_angle(variant):
+    """Opening angle for the ``variant``-th of several drafts; the first draft gets the plain brief."""
+    return WRITER_ANGLES[variant % len(WRITER_ANGLES)]
+
+
+def editing_request(draft, facts):
+    return f"Script to edit:\n{draft}\n\nWiki fact sheet to verify facts against:\n{facts}"
+
+
+# The prompt text each stage's output depends on, for memoized stage outputs: editing one stage's
+# prompts only invalidates that stage.
+STAGE_PROMPTS = {
+    "search": (SEARCHER, SEARCHER_INSTRUCTIONS, RESEARCH_TASK),
+    "write": (WRITER, WRITER_INSTRUCTIONS, WRITING_TASK, WRITER_ANGLES),
+    "edit": (EDITOR, STAGE_EDITOR_INSTRUCTIONS, EDITING_TASK, REPAIRER, REPAIRER_INSTRUCTIONS),
+}
+
+
+def prompt_version(stage):
+    return hashlib.sha256(repr(STAGE_PROMPTS.get(stage, ())).encode("utf-8")).hexdigest()[:12]
+
+
+# Sidebar copy shared by the app for every backend.
+SIDEBAR_TIPS = """
+**For Best Results:**
+- Speak clearly and with enthusiasm
+- Pause at ellipses (...) for dramatic effect
+- Emphasize bolded words and names
+- Use hand gestures for size comparisons
+- End with energy to encourage engagement
+
+**Viral Potential Indicators:**
+- ✅ Starts with surprising contradiction
+- ✅ Includes specific numbers/measurements
+- ✅ Reveals lesser-known canon information
+- ✅ Ends with cliffhanger or revelation
+- ✅ Under 60 seconds reading time
+"""
+SIDEBAR_FORMAT_EXAMPLE = """
+**Correct Format:**
+```
+**SHORT 28: Title Here**
+
+Luffy might be the strongest...
+
+But this guy is actually stronger.
+
+**Character Name** ate the X-X fruit.
+
+He's 300 feet tall.
+
+He destroyed half a city.
+
+And walked away with just bruises.
+
+This guy's story is far from over.
+```
+
+**❌ Wrong Format:**
+- Long paragraphs
+- Section headers (HOOK:, etc.)
+- Verbose explanations
+- Over 120 words
+"""
+SIDEBAR_PERFORMANCE = """
+**Top performing elements:**
+- Size comparisons (Eiffel Tower, Statue of Liberty)
+- "But this guy..." reveals
+- Specific numbers (300 feet, 51 divisions)
+- Hidden connections between characters
+- Abilities that defy expectations
+"""
+SCRIPT_TIP = "💡 Tip: This script is optimized for 45-60 seconds of reading time. Practice your delivery for maximum engagement!"
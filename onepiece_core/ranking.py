@@ -0,0 +1,82 @@
+import re
+from dataclasses import asdict, dataclass
+
+from onepiece_core.history import get_history
+from onepiece_core.validate import MAX_SENTENCE_WORDS, MAX_WORDS, MIN_WORDS, body_lines, validate_script, words
+
+
+NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+HOOK_WORDS = {"never", "only", "secret", "hidden", "actually", "nobody", "no one", "most", "why", "how", "what", "real"}
+# Weights of the score components, each of which is between 0 and 1.
+WEIGHTS = {"hook": 0.3, "facts": 0.25, "format": 0.2, "length": 0.15, "novelty": 0.1}
+
+
+@dataclass
+class DraftScore:
+    index: int
+    total: float
+    hook: float
+    facts: float
+    format: float
+    length: float
+    novelty: float
+    word_count: int
+    violations: int
+    draft: str = ""
+
+    def to_dict(self):
+        return {key: value for key, value in asdict(self).items() if key != "draft"}
+
+
+def numbers(text):
+    return {match.replace(",", "") for match in NUMBER.findall(text.replace("**", ""))}
+
+
+def hook_score(script):
+    """How strongly the first line opens: short, concrete (a number or a name) and curious."""
+    lines = body_lines(script)
+    if not lines:
+        return 0.0
+    first = lines[0][1]
+    lowered = first.lower()
+    score = 0.3 if len(words(first)) <= MAX_SENTENCE_WORDS else 0.0
+    score += 0.2 if NUMBER.search(first) else 0.0
+    score += 0.15 if "**" in first else 0.0
+    score += 0.15 if first.rstrip("*\"'”").endswith(("?", "!")) else 0.0
+    score += 0.2 if any(re.search(rf"\b{word}\b", lowered) for word in HOOK_WORDS) else 0.0
+    return round(score, 3)
+
+
+def facts_score(script, facts):
+    """Numbers from the fact sheet make a short concrete; numbers that are not on it are likely made up."""
+    used = numbers("\n".join(line for _, line in body_lines(script)))
+    known = numbers(facts)
+    grounded = len(used & known)
+    return round(max(0.0, min(grounded, 3) / 3 - 0.25 * len(used - known)), 3)
+
+
+def length_score(word_count):
+    if MIN_WORDS <= word_count <= MAX_WORDS:
+        return 1.0
+    distance = MIN_WORDS - word_count if word_count < MIN_WORDS else word_count - MAX_WORDS
+    return round(max(0.0, 1 - distance / 40), 3)
+
+
+def score_draft(index, draft, facts, history):
+    report = validate_script(draft)
+    components = {
+        "hook": hook_score(draft),
+        "facts": facts_score(draft, facts),
+        "format": round(1 / (1 + len(report.violations)), 3),
+        "length": length_score(report.word_count),
+        "novelty": round(1 - max(0.0, history.script_similarity(draft)), 3),
+    }
+    total = round(sum(WEIGHTS[name] * value for name, value in components.items()), 3)
+    return DraftScore(index, total, **components, word_count=report.word_count, violations=len(report.violations), draft=draft)
+
+
+def rank_drafts(drafts, facts, history=None):
+    """Score every draft locally (no LLM calls) and return the scores, best first."""
+    history = history or get_history()
+    scores = [score_draft(index, draft, facts, history) for index, draft in enumerate(drafts)]
+    return sorted(scores, key=lambda score: (-score.total, score.index))
@@ -0,0 +1,72 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate_per_minute`` acquisitions per minute, with bursts up to ``burst``."""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 6))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def wait_time(self, amount=1):
+        """Seconds until ``amount`` could be acquired, or 0 if it can be now."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (amount - self.tokens) / self.rate)
+
+    def charge(self, amount):
+        """Spend ``amount`` without waiting, or refund it if negative. The balance can go below zero,
+        so usage only known after a request is paid for by the requests that follow."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+# Applied until a caller configures the provider itself, so interactive runs do not hammer fandom
+# either; keyed by host like the transport's buckets.
+DEFAULT_RATES = {
+    "onepiece.fandom.com": 60,
+}
+
+_limiters = {}
+_configured = set()
+_limiters_lock = threading.Lock()
+
+
+def set_rate_limit(provider, rate_per_minute, burst=None):
+    with _limiters_lock:
+        _configured.add(provider)
+        if rate_per_minute:
+            _limiters[provider] = RateLimiter(rate_per_minute, burst)
+        else:
+            _limiters.pop(provider, None)
+
+
+def acquire(provider, amount=1):
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None and provider in DEFAULT_RATES and provider not in _configured:
+            _configured.add(provider)
+            limiter = _limiters[provider] = RateLimiter(DEFAULT_RATES[provider])
+    if limiter is not None:
+        limiter.acquire(amount)
@@ -0,0 +1,80 @@
+import os
+from dataclasses import dataclass, field
+
+
+# Model per stage. Picking a URL from search results and fixing flagged lines are easy enough for the
+# smallest model; the writer is where quality shows, so it keeps the backend's own MODEL_ID ("default").
+DEFAULT_ROUTES = {
+    "search": "gpt-4.1-nano",
+    "write": "default",
+    "edit": "gpt-4.1-nano",
+}
+# Next model up when a stage's output fails validation.
+ESCALATIONS = {
+    "gpt-4.1-nano": "gpt-4.1-mini",
+    "gpt-4.1-mini": "gpt-4.1",
+    "gpt-4o-mini": "gpt-4o",
+}
+
+
+@dataclass
+class ModelRouter:
+    default_model: str
+    routes: dict = field(default_factory=lambda: dict(DEFAULT_ROUTES))
+    escalations: dict = field(default_factory=lambda: dict(ESCALATIONS))
+
+    def model(self, stage):
+        model = self.routes.get(stage, "default")
+        return self.default_model if model == "default" else model
+
+    def escalation(self, stage):
+        return self.escalations.get(self.model(stage))
+
+
+def parse_routes(text):
+    """``"search=gpt-4.1-nano,write=gpt-4.1-mini"`` -> ``{"search": ..., "write": ...}``."""
+    routes = {}
+    for item in (text or "").split(","):
+        stage, _, model = item.partition("=")
+        if stage.strip() and model.strip():
+            routes[stage.strip()] = model.strip()
+    return routes
+
+
+def load_router(default_model, routes=None):
+    """Router for a backend, with ``ONEPIECE_MODEL_ROUTES`` and then ``routes`` overriding the
+    defaults; ``ONEPIECE_MODEL_ROUTES=all=default`` pins every stage to the backend's model."""
+    merged = dict(DEFAULT_ROUTES)
+    for overrides in (parse_routes(os.environ.get("ONEPIECE_MODEL_ROUTES")), routes or {}):
+        overrides = dict(overrides)
+        if "all" in overrides:
+            merged = dict.fromkeys(merged, overrides.pop("all"))
+        merged.update(overrides)
+    return ModelRouter(default_model, merged)
+
+
+def run_with_escalation(router, stage, run, ok):
+    """Call ``run(model)`` with the stage's routed model, and once more with the escalation model
+    if ``ok(result)`` is false. Returns every attempt's result, oldest first."""
+    results = [run(router.model(stage))]
+    stronger = router.escalation(stage)
+    if not ok(results[-1]) and stronger is not None:
+        results.append(run(stronger))
+    return results
+
+
+def sum_usage(usages):
+    total = {}
+    for usage in usages:
+        for key, value in usage.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def stage_usage(router, stage, usages):
+    """Usage of every attempt summed and tagged with the routed model (and the escalation model,
+    if a second attempt ran), for the stage span and the per-model report."""
+    total = {"model": router.model(stage), **sum_usage(usages)}
+    if len(usages) > 1:
+        total["escalated_to"] = router.escalation(stage)
+    return total
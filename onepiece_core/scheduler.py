@@ -0,0 +1,215 @@
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from onepiece_core import tracing
+from onepiece_core.extract import estimate_tokens
+from onepiece_core.ratelimit import RateLimiter
+
+
+# Requests made outside any session (a script calling the tools directly) share this turn.
+DEFAULT_SESSION = "default"
+# Output tokens charged up front per LLM request; the real count is settled once the run returns.
+EXPECTED_OUTPUT_TOKENS = 500
+
+
+@dataclass(frozen=True)
+class Session:
+    """One user's API keys. The app keeps it in its session state and the job queue in memory; it
+    reaches the tools through ``use_session`` and is never written to the environment."""
+
+    id: str
+    openai_api_key: str = field(repr=False)
+    search_api_key: str = field(repr=False)
+    search_provider: str = "serpapi"
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Requests and tokens per minute allowed on one API key; 0 means unlimited."""
+
+    rpm: int = 0
+    tpm: int = 0
+
+
+def default_budget(provider):
+    if provider == "openai":
+        return Budget(int(os.environ.get("ONEPIECE_OPENAI_RPM", 60)), int(os.environ.get("ONEPIECE_OPENAI_TPM", 200_000)))
+    return Budget(int(os.environ.get("ONEPIECE_SEARCH_RPM", 30)))
+
+
+def key_id(api_key):
+    """Short digest naming a key in budgets and traces, so the key itself is never logged."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+_session = contextvars.ContextVar("onepiece_session", default=None)
+
+
+@contextmanager
+def use_session(session):
+    """Run the enclosed code (and threads started with a copy of its context) on ``session``'s keys
+    and turn."""
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
+
+
+def current_session():
+    return _session.get()
+
+
+class KeyQueue:
+    """Request and token buckets of one API key, granted to waiting sessions in turn.
+
+    Each session waits in its own line, and the lines are served round-robin: a session with ten
+    queued requests gets one, then every other waiting session gets one, and so on. Within a line
+    requests are served in arrival order.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.requests = RateLimiter(budget.rpm) if budget.rpm else None
+        # OpenAI lets a whole minute's tokens go in one request, so the bucket can burst that far.
+        self.tokens = RateLimiter(budget.tpm, burst=budget.tpm) if budget.tpm else None
+        self._lines = OrderedDict()
+        self._turn = threading.Condition()
+
+    def _wait_time(self, requests, tokens):
+        return max(
+            self.requests.wait_time(requests) if self.requests is not None and requests > 0 else 0.0,
+            self.tokens.wait_time(tokens) if self.tokens is not None and tokens > 0 else 0.0,
+        )
+
+    def charge(self, requests, tokens):
+        if self.requests is not None:
+            self.requests.charge(requests)
+        if self.tokens is not None:
+            self.tokens.charge(tokens)
+
+    def acquire(self, session_id, requests=1, tokens=0):
+        """Block until it is ``session_id``'s turn and the budget has room, then spend it. Returns the
+        seconds spent waiting."""
+        started = time.monotonic()
+        ticket = object()
+        with self._turn:
+            self._lines.setdefault(session_id, deque()).append(ticket)
+            try:
+                while True:
+                    wait = None
+                    if next(iter(self._lines)) == session_id and self._lines[session_id][0] is ticket:
+                        wait = self._wait_time(requests, tokens)
+                        if wait <= 0:
+                            break
+                    self._turn.wait(wait)
+                self.charge(requests, tokens)
+            finally:
+                line = self._lines[session_id]
+                line.remove(ticket)
+                if line:
+                    self._lines.move_to_end(session_id)
+                else:
+                    del self._lines[session_id]
+                self._turn.notify_all()
+        return time.monotonic() - started
+
+    def stats(self):
+        with self._turn:
+            waiting = {session_id: len(line) for session_id, line in self._lines.items()}
+        return {
+            "rpm": self.budget.rpm,
+            "tpm": self.budget.tpm,
+            "requests_left": int(self.requests.tokens) if self.requests is not None else None,
+            "tokens_left": int(self.tokens.tokens) if self.tokens is not None else None,
+            "waiting_sessions": len(waiting),
+            "waiting_requests": sum(waiting.values()),
+        }
+
+
+@dataclass
+class Ticket:
+    """A granted turn. ``settle`` charges the difference between what a run actually used and what
+    was charged up front; a ticket without a queue (no active session) settles nothing."""
+
+    queue: KeyQueue = None
+    requests: int = 0
+    tokens: int = 0
+
+    def settle(self, usage):
+        if self.queue is None or not usage:
+            return
+        used = usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+        self.queue.charge(usage.get("llm_calls", 0) - self.requests, used - self.tokens)
+
+
+class Scheduler:
+    """Per-key budgets for the OpenAI and search APIs. Every session using the same key shares that
+    key's ``KeyQueue``; budgets come from ``set_budget`` or the ``ONEPIECE_OPENAI_RPM``,
+    ``ONEPIECE_OPENAI_TPM`` and ``ONEPIECE_SEARCH_RPM`` environment variables."""
+
+    def __init__(self):
+        self._budgets = {}
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def set_budget(self, provider, rpm, tpm=0, api_key=None):
+        """Budget for ``api_key`` on ``provider``, or for every key on it without ``api_key``. Takes
+        effect on the next request."""
+        with self._lock:
+            self._budgets[(provider, key_id(api_key) if api_key else None)] = Budget(rpm, tpm)
+            for key in [key for key in self._queues if key[0] == provider]:
+                del self._queues[key]
+
+    def queue(self, provider, api_key):
+        key = (provider, key_id(api_key))
+        with self._lock:
+            if key not in self._queues:
+                budget = self._budgets.get(key) or self._budgets.get((provider, None)) or default_budget(provider)
+                self._queues[key] = KeyQueue(budget)
+            return self._queues[key]
+
+    def acquire(self, provider, api_key, requests=1, tokens=0):
+        """Wait for the current session's turn on ``api_key`` and return a ``Ticket``."""
+        session = current_session()
+        queue = self.queue(provider, api_key)
+        waited = queue.acquire(session.id if session is not None else DEFAULT_SESSION, requests, tokens)
+        active = tracing.current_span()
+        if active is not None and waited >= 0.01:
+            active.add("queued_seconds", round(waited, 3))
+        return Ticket(queue, requests, tokens)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
+
+
+def llm_turn(prompt="", requests=1):
+    """Wait for the active session's turn on its OpenAI key before an agent run that is expected to
+    make ``requests`` calls. Outside a session (batch mode and the bench meter on their own) it
+    returns at once."""
+    session = current_session()
+    if session is None:
+        return Ticket()
+    tokens = estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS * requests
+    return get_scheduler().acquire("openai", session.openai_api_key, requests, tokens)
+
+
+def search_turn(provider, api_key):
+    """Wait for the active session's turn on a search key before a live search."""
+    if current_session() is not None:
+        get_scheduler().acquire(provider, api_key)
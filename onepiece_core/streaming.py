@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class StreamEvent:
+    """Backend-neutral progress event.
+
+    ``kind`` is one of ``stage`` (a new agent/stage started, ``text`` is its name), ``tool``
+    (a tool call, ``text`` describes it), ``token`` (a chunk of generated text) or ``result``
+    (the final script once the run is over).
+    """
+
+    kind: str
+    text: str
@@ -0,0 +1,232 @@
+import functools
+import json
+import re
+from urllib.parse import urlsplit
+
+import requests
+
+from onepiece_core import scheduler, tracing, wikiindex
+from onepiece_core.cache import get_cache
+from onepiece_core.extract import ExtractionReport, estimate_tokens, extract_fact_sheet, record_report
+from onepiece_core.history import DuplicateTopicError, get_history
+from onepiece_core.transport import conditional_headers, get_transport, response_validators
+
+
+USER_AGENT = "Mozilla/5.0 (compatible; OnePieceShortScriptCreator/1.0)"
+MAX_FALLBACK_CHARS = 6000
+WIKI_URL = re.compile(r"https?://onepiece\.fandom\.com/wiki/[^\s)\]>\"'*`]+")
+SERPAPI_URL = "https://serpapi.com/search.json"
+SERPER_URL = "https://google.serper.dev/search"
+
+
+def _organic_results(results, num_results):
+    return json.dumps(
+        [
+            {"title": item.get("title"), "link": item.get("link"), "snippet": item.get("snippet")}
+            for item in results[:num_results]
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _traced_fetch(source, key, fetch, name, **attributes):
+    """Run a cached fetch inside a client span recording cache hits, bytes and retries (the
+    transport adds to ``retries`` on the active span)."""
+    with tracing.span(name, kind="client", source=source, cache_hit=True, retries=0, **attributes) as active:
+
+        def traced():
+            active.set(cache_hit=False)
+            body = fetch()
+            active.set(bytes=len(body.encode("utf-8")))
+            return body
+
+        return get_cache().get_or_fetch(source, key, traced)
+
+
+def _traced_conditional_fetch(source, key, fetch, name, **attributes):
+    """Like ``_traced_fetch`` for ``fetch(validators) -> (body, validators)``; an expired copy is
+    revalidated with a conditional GET and a 304 is recorded as ``not_modified``."""
+    with tracing.span(name, kind="client", source=source, cache_hit=True, retries=0, **attributes) as active:
+
+        def traced(validators):
+            active.set(cache_hit=False, revalidated=bool(validators))
+            body, validators = fetch(validators)
+            active.set(not_modified=body is None, bytes=0 if body is None else len(body.encode("utf-8")))
+            return body, validators
+
+        return get_cache().get_or_revalidate(source, key, traced)
+
+
+def _redacted_error(error, url):
+    """``error`` with only the status code and host in its message. requests puts the full URL,
+    query string included, into its messages, and the SerpApi key travels in the query string."""
+    host = urlsplit(url).netloc
+    response = getattr(error, "response", None)
+    if response is not None:
+        message = f"{response.status_code} {response.reason or 'error'} from {host}"
+    else:
+        message = f"request to {host} failed"
+    try:
+        return type(error)(message, response=response)
+    except TypeError:
+        return requests.RequestException(message, response=response)
+
+
+def _host_only_errors(url):
+    """Decorate a fetch so the request errors it raises name only the status code and host of ``url``."""
+
+    def decorate(fetch):
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs):
+            try:
+                return fetch(*args, **kwargs)
+            except requests.RequestException as e:
+                raise _redacted_error(e, url) from None
+
+        return wrapper
+
+    return decorate
+
+
+def tool_errors_as_text(fn):
+    """Return network failures to the agent as text, so one failed call (after the transport's
+    retries) lets the agent try another result instead of ending the whole run."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except requests.RequestException as e:
+            return f"TOOL ERROR: {type(e).__name__}: {e}. Try again later or use a different result."
+
+    return wrapper
+
+
+def serpapi_search(query, api_key, num_results=10):
+    @_host_only_errors(SERPAPI_URL)
+    def fetch():
+        scheduler.search_turn("serpapi", api_key)
+        response = get_transport().get(
+            SERPAPI_URL,
+            params={"engine": "google", "q": query, "num": num_results, "api_key": api_key},
+            bucket="serpapi",
+        )
+        response.raise_for_status()
+        return _organic_results(response.json().get("organic_results", []), num_results)
+
+    return _traced_fetch("serpapi", f"{query} num={num_results}", fetch, "tool.search", query=query)
+
+
+def serper_search(query, api_key, num_results=10):
+    @_host_only_errors(SERPER_URL)
+    def fetch():
+        scheduler.search_turn("serper", api_key)
+        response = get_transport().post(
+            SERPER_URL,
+            json={"q": query, "num": num_results},
+            headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+            bucket="serper",
+        )
+        response.raise_for_status()
+        return _organic_results(response.json().get("organic", []), num_results)
+
+    return _traced_fetch("serper", f"{query} num={num_results}", fetch, "tool.search", query=query)
+
+
+@tool_errors_as_text
+def wiki_search(query, num_results, live_search):
+    """Search the local wiki index, falling back to ``live_search(query, num_results)`` when no
+    index has been built or nothing in it matches. Pages that already have a short are dropped."""
+    covered = get_history().covered_urls()
+    index = wikiindex.get_index()
+    if index is not None:
+        with tracing.span("tool.search", source="wiki_index", query=query) as active:
+            results = [r for r in index.search(query, num_results + len(covered)) if r["link"] not in covered]
+            active.set(results=len(results))
+        if results:
+            return json.dumps(results[:num_results], ensure_ascii=False)
+    results = live_search(query, num_results)
+    if not covered:
+        return results
+    return json.dumps([r for r in json.loads(results) if r.get("link") not in covered], ensure_ascii=False)
+
+
+def find_wiki_url(text):
+    match = WIKI_URL.search(text or "")
+    return match.group(0).rstrip(".,;:!?") if match else None
+
+
+def fetch_page(url):
+    @_host_only_errors(url)
+    def fetch(validators):
+        response = get_transport().get(url, headers={"User-Agent": USER_AGENT, **conditional_headers(validators)})
+        if response.status_code == 304:
+            return None, {key: value for key, value in response_validators(response).items() if value} or validators
+        response.raise_for_status()
+        return response.text, response_validators(response)
+
+    return _traced_conditional_fetch("page", url, fetch, "tool.fetch", url=url)
+
+
+def page_text(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    root = soup.select_one(".mw-parser-output") or soup.body or soup
+    for tag in root(["script", "style", "noscript", "nav", "footer"]):
+        tag.decompose()
+    return "\n".join(line for line in (" ".join(s.split()) for s in root.stripped_strings) if line)
+
+
+def read_fact_sheet(url):
+    with tracing.span("tool.read_website", url=url) as active:
+        html = fetch_page(url)
+        sheet = extract_fact_sheet(html, url)
+        text = page_text(html)
+        # Pages without an infobox or known sections (non-wiki URLs) fall back to trimmed page text.
+        rendered = text[:MAX_FALLBACK_CHARS] if sheet.is_empty() else sheet.render()
+        report = ExtractionReport(url, estimate_tokens(text), estimate_tokens(rendered))
+        record_report(report)
+        active.set(raw_tokens=report.raw_tokens, sheet_tokens=report.sheet_tokens)
+    return sheet, rendered
+
+
+def read_new_topic(url):
+    """Fact sheet for ``url``; raises DuplicateTopicError if an earlier short covered the same topic."""
+    rendered = read_fact_sheet(url)[1]
+    get_history().ensure_new_topic(url, rendered)
+    return rendered
+
+
+def covered_topics_hint():
+    """Instruction listing characters that already have a short, or "" before the first one."""
+    topics = get_history().covered_topics()
+    return f"Skip characters that already have a short: {', '.join(topics)}." if topics else ""
+
+
+def topic_name(facts, url):
+    first = facts.splitlines()[0] if facts else ""
+    return first[2:].strip() if first.startswith("# ") else url.rstrip("/").rsplit("/", 1)[-1].replace("_", " ")
+
+
+def record_script(url, script, facts=None):
+    """Store a finished script in the history under the next SHORT number and return the entry
+    (its ``script`` carries the number). Raises DuplicateTopicError for an already covered topic."""
+    facts = facts if facts is not None else read_fact_sheet(url)[1]
+    history = get_history()
+    history.ensure_new_topic(url, facts)
+    return history.add(topic_name(facts, url), url, facts, script)
+
+
+@tool_errors_as_text
+def read_website(url: str) -> str:
+    """Read a One Piece Wiki page and return a compact fact sheet: infobox (height, devil fruit,
+    bounty, affiliations) plus the Abilities, History and Trivia sections.
+
+    Args:
+        url (str): Full URL of the page to read.
+    """
+    try:
+        return read_new_topic(url)
+    except DuplicateTopicError as e:
+        return f"DUPLICATE TOPIC: this page was {e}. Do not write about it; a different character is needed."
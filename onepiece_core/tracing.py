@@ -0,0 +1,304 @@
+import contextvars
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from onepiece_core.cache import cache_dir
+
+
+# USD per 1M tokens (input, output), used for rough per-run cost estimates.
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+MAX_TRACE_FILE_BYTES = 20 * 1024 * 1024
+SPAN_KINDS = {"internal": "SPAN_KIND_INTERNAL", "client": "SPAN_KIND_CLIENT"}
+# Error messages often quote the request URL, and some APIs take the key in its query string.
+URL_QUERY = re.compile(r"(https?://[^\s?#'\"]+)\?[^\s'\"]*")
+SECRET_PARAM = re.compile(r"((?:api_?key|key|token|access_token)=)[^&\s'\"]+", re.IGNORECASE)
+
+_current = contextvars.ContextVar("onepiece_span", default=None)
+_export_lock = threading.Lock()
+
+
+def estimate_cost(model, input_tokens, output_tokens):
+    prices = MODEL_PRICES.get((model or "").split("/")[-1])
+    if prices is None:
+        return 0.0
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+
+def redact(message):
+    """``message`` without URL query strings or ``api_key=...``-style parameters."""
+    return SECRET_PARAM.sub(r"\1[redacted]", URL_QUERY.sub(r"\1", str(message)))
+
+
+def prefix_digest(text):
+    """Short hash of a prompt's static prefix, so spans show whether calls shared a cacheable prefix."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:12]
+
+
+def traces_path():
+    return os.environ.get("ONEPIECE_TRACE_FILE") or os.path.join(cache_dir(), "traces.jsonl")
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str = "internal"
+    trace_id: str = field(default_factory=lambda: secrets.token_hex(16))
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = None
+    attributes: dict = field(default_factory=dict)
+    error: str = None
+
+    def set(self, **attributes):
+        self.attributes.update((key, value) for key, value in attributes.items() if value is not None)
+
+    def add(self, key, amount):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_otel(self):
+        # OTLP/JSON span layout, one span per line, so the file can be replayed into a collector.
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, "SPAN_KIND_INTERNAL"),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": key, "value": _otel_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error} if self.error else {"code": "STATUS_CODE_OK"},
+        }
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _plain_value(value):
+    if "intValue" in value:
+        return int(value["intValue"])
+    return next(iter(value.values()))
+
+
+def current_span():
+    return _current.get()
+
+
+def start_span(name, kind="internal", parent=None, **attributes):
+    parent = parent or _current.get()
+    span = Span(name=name, kind=kind)
+    if parent is not None:
+        span.trace_id, span.parent_id = parent.trace_id, parent.span_id
+    span.set(**attributes)
+    return span
+
+
+def end_span(span, error=None):
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {redact(error)}"
+    export(span)
+
+
+def activate(active):
+    return _current.set(active)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def span(name, kind="internal", parent=None, **attributes):
+    active = start_span(name, kind, parent, **attributes)
+    token = _current.set(active)
+    try:
+        yield active
+    except Exception as e:
+        _current.reset(token)
+        end_span(active, e)
+        raise
+    _current.reset(token)
+    end_span(active)
+
+
+def record_span(name, seconds, kind="internal", parent=None, error=None, **attributes):
+    """Export an already-finished span (e.g. an LLM call reported after the fact) ending now."""
+    finished = start_span(name, kind, parent, **attributes)
+    finished.end_ns = time.time_ns()
+    finished.start_ns = finished.end_ns - int(seconds * 1e9)
+    finished.error = redact(error) if error else error
+    export(finished)
+    return finished
+
+
+def record_llm_call(model, seconds, input_tokens, output_tokens, parent=None, error=None, **attributes):
+    return record_span(
+        "llm.chat",
+        seconds,
+        kind="client",
+        parent=parent,
+        error=error,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=round(estimate_cost(model, input_tokens, output_tokens), 6),
+        **attributes,
+    )
+
+
+def export(finished):
+    path = traces_path()
+    line = json.dumps(finished.to_otel(), ensure_ascii=False) + "\n"
+    with _export_lock:
+        if os.path.exists(path) and os.path.getsize(path) > MAX_TRACE_FILE_BYTES:
+            os.replace(path, path + ".1")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def read_spans(max_bytes=2 * 1024 * 1024):
+    path = traces_path()
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        f.seek(max(0, os.path.getsize(path) - max_bytes))
+        lines = f.read().decode("utf-8", errors="ignore").splitlines()
+    spans = []
+    for line in lines:
+        try:
+            spans.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return spans
+
+
+def summarize_runs(limit=10):
+    """Per-trace totals for the most recent ``limit`` pipeline runs, newest first."""
+    traces = OrderedDict()
+    for raw in read_spans():
+        traces.setdefault(raw["traceId"], []).append(raw)
+    runs = []
+    for trace_id, spans in traces.items():
+        root = next((s for s in spans if not s["parentSpanId"]), None)
+        if root is None or root["name"] != "pipeline":
+            continue
+        attributes = {a["key"]: _plain_value(a["value"]) for a in root["attributes"]}
+        summary = {
+            "trace": trace_id[:8],
+            "backend": attributes.get("backend", ""),
+            "mode": attributes.get("mode", ""),
+            "seconds": round((int(root["endTimeUnixNano"]) - int(root["startTimeUnixNano"])) / 1e9, 2),
+            "llm_calls": 0,
+            "input_tokens": 0,
+            "cached_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+            "llm_s": 0.0,
+            "search_s": 0.0,
+            "fetch_s": 0.0,
+            "bytes_fetched": 0,
+            "retries": 0,
+            "status": "error" if root["status"]["code"] == "STATUS_CODE_ERROR" else "ok",
+        }
+        for s in spans:
+            values = {a["key"]: _plain_value(a["value"]) for a in s["attributes"]}
+            seconds = (int(s["endTimeUnixNano"]) - int(s["startTimeUnixNano"])) / 1e9
+            if s["name"] == "llm.chat":
+                summary["llm_calls"] += 1
+                summary["llm_s"] += seconds
+                summary["input_tokens"] += values.get("input_tokens", 0)
+                summary["cached_tokens"] += values.get("cached_tokens", 0)
+                summary["output_tokens"] += values.get("output_tokens", 0)
+                summary["cost_usd"] += values.get("cost_usd", 0.0)
+            elif s["name"] == "tool.search":
+                summary["search_s"] += seconds
+            elif s["name"] == "tool.fetch":
+                summary["fetch_s"] += seconds
+                summary["bytes_fetched"] += values.get("bytes", 0)
+            summary["retries"] += values.get("retries", 0)
+        for key in ("llm_s", "search_s", "fetch_s"):
+            summary[key] = round(summary[key], 2)
+        summary["cost_usd"] = round(summary["cost_usd"], 4)
+        runs.append(summary)
+    return runs[::-1][:limit]
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_stage_models(limit=100):
+    """Latency and estimated cost per (stage, model) over the most recent ``limit`` traces, for
+    comparing model routes. ``model`` is the routed model and ``escalated`` counts runs that needed
+    the stronger one. Team-delegation runs have no stage spans, so their LLM calls are grouped by
+    agent and the calls' own time stands in for stage latency."""
+    traces = OrderedDict()
+    for raw in read_spans():
+        traces.setdefault(raw["traceId"], []).append(raw)
+    groups = {}
+    for spans in list(traces.values())[-limit:]:
+        stages = {s["spanId"]: s for s in spans if s["name"].startswith("stage.")}
+        costs = {}
+        agents = {}
+        for s in spans:
+            if s["name"] != "llm.chat":
+                continue
+            values = {a["key"]: _plain_value(a["value"]) for a in s["attributes"]}
+            costs[s["parentSpanId"]] = costs.get(s["parentSpanId"], 0.0) + values.get("cost_usd", 0.0)
+            if s["parentSpanId"] not in stages:
+                seconds = (int(s["endTimeUnixNano"]) - int(s["startTimeUnixNano"])) / 1e9
+                key = (values.get("agent", "?"), values.get("model", "?"))
+                total = agents.setdefault(key, [0.0, 0.0])
+                total[0] += seconds
+                total[1] += values.get("cost_usd", 0.0)
+        for span_id, s in stages.items():
+            values = {a["key"]: _plain_value(a["value"]) for a in s["attributes"]}
+            if not values.get("llm_calls"):
+                continue
+            seconds = (int(s["endTimeUnixNano"]) - int(s["startTimeUnixNano"])) / 1e9
+            row = groups.setdefault((s["name"][len("stage."):], values.get("model", "?")), [[], [], 0])
+            row[0].append(seconds)
+            row[1].append(costs.get(span_id, 0.0))
+            row[2] += "escalated_to" in values
+        for key, (seconds, cost) in agents.items():
+            row = groups.setdefault(key, [[], [], 0])
+            row[0].append(seconds)
+            row[1].append(cost)
+    return [
+        {
+            "stage": stage,
+            "model": model,
+            "runs": len(seconds),
+            "p50_s": round(_percentile(seconds, 50), 2),
+            "p90_s": round(_percentile(seconds, 90), 2),
+            "cost_per_run_usd": round(sum(costs) / len(costs), 5),
+            "escalated": escalated,
+        }
+        for (stage, model), (seconds, costs, escalated) in sorted(groups.items())
+    ]
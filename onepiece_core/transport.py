@@ -0,0 +1,124 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from onepiece_core import ratelimit, tracing
+
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = 20
+# fandom starts answering 429 well before this, so it also bounds the pool size per host.
+DEFAULT_MAX_PER_HOST = 4
+
+
+class Transport:
+    """One pooled ``requests`` session shared by every tool.
+
+    Connections are kept alive per host, so repeated fetches skip the TCP and TLS handshakes.
+    Each request first takes a token from the host's rate limiter (``ratelimit``, keyed by host
+    unless a ``bucket`` is given) and a slot from a per-host semaphore that caps concurrent
+    requests. Connection errors, timeouts, 429s and 5xx responses are retried with full-jitter
+    exponential backoff, honouring ``Retry-After``.
+    """
+
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, max_retries=MAX_RETRIES, timeout=DEFAULT_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_per_host, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+    def request(self, method, url, bucket=None, retry_statuses=RETRY_STATUSES, **kwargs):
+        """Send a request and return the final response; raises ``requests.RequestException``
+        once the retries are used up."""
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            ratelimit.acquire(bucket or host)
+            error = None
+            with self._slot(host):
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, error = None, e
+            if response is not None and response.status_code not in retry_statuses:
+                return response
+            if attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response
+            delay = retry_after(response) if response is not None else None
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+            active = tracing.current_span()
+            if active is not None:
+                active.add("retries", 1)
+            time.sleep(min(delay, BACKOFF_CAP))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+def retry_after(response):
+    """Seconds the server asked us to wait, from a numeric or HTTP-date ``Retry-After``."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def conditional_headers(validators):
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response):
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport(max_per_host=int(os.environ.get("ONEPIECE_MAX_PER_HOST", DEFAULT_MAX_PER_HOST)))
+        return _transport
@@ -0,0 +1,193 @@
+import re
+import statistics
+import time
+
+import streamlit as st
+
+from onepiece_core import scheduler, tools, tracing
+from onepiece_core.history import DuplicateTopicError, get_history
+from onepiece_core.jobs import get_jobs
+from onepiece_core.voiceover import MAX_SECONDS, MIN_SECONDS, caption_name, time_script, to_srt, to_ssml
+
+
+def render_stream(events):
+    """Render backend stream events live and return ``(final_text, time_to_first_token)``."""
+    status = st.status("Starting agents...", expanded=True)
+    output = st.empty()
+    started = time.perf_counter()
+    time_to_first_token = None
+    text = ""
+    result = None
+    for event in events:
+        if event.kind == "stage":
+            status.update(label=f"Running: {event.text}")
+            status.write(f"▶️ {event.text}")
+            text = ""
+        elif event.kind == "tool":
+            status.write(f"🔧 {event.text}")
+        elif event.kind == "token":
+            if time_to_first_token is None:
+                time_to_first_token = time.perf_counter() - started
+            text += event.text
+            output.markdown(text + "▌")
+        elif event.kind == "result":
+            result = event.text
+    status.update(label="Done", state="complete", expanded=False)
+    result = result if result is not None else text
+    output.markdown(result)
+    return result, time_to_first_token
+
+
+def record_time_to_first_token(seconds):
+    if seconds is not None:
+        st.session_state.setdefault("ttft_history", []).append(seconds)
+
+
+def render_streaming_metrics():
+    history = st.session_state.get("ttft_history", [])
+    st.sidebar.markdown("## ⚡ Streaming")
+    if history:
+        st.sidebar.markdown(
+            f"- Time to first token (last run): {history[-1]:.2f} s\n"
+            f"- Median over {len(history)} runs: {statistics.median(history):.2f} s"
+        )
+    else:
+        st.sidebar.caption("No streamed runs yet.")
+
+
+def render_violations(report):
+    """List the format rules the final script still breaks and the claims not found on the wiki page, if any."""
+    if report.ok:
+        st.caption(f"✅ Format rules and fact check passed ({report.word_count} words)")
+        return
+    grounding = sum(violation.rule == "grounding" for violation in report.violations)
+    st.warning(
+        f"⚠️ {len(report.violations) - grounding} format rule violation(s), {grounding} line(s) not backed by the wiki page "
+        f"({report.word_count} words)"
+    )
+    st.markdown("\n".join(
+        f"- {'line ' + str(violation.line) + ': ' if violation.line else ''}{violation.message}"
+        for violation in report.violations
+    ))
+
+
+def render_trimmed(trimmed):
+    if trimmed:
+        st.caption(f"✂️ Trimmed {len(trimmed)} line(s) to fit {MAX_SECONDS} s of voiceover: " + " / ".join(trimmed))
+
+
+def render_voiceover(script, key):
+    """Estimated voiceover length, per-line timings and SRT/SSML downloads for ``script``."""
+    timing = time_script(script)
+    if timing.ok:
+        st.caption(f"🎙️ Reads in about {timing.seconds:.0f} s (target {MIN_SECONDS}-{MAX_SECONDS} s)")
+    else:
+        st.warning(f"🎙️ Reads in about {timing.seconds:.0f} s, outside the {MIN_SECONDS}-{MAX_SECONDS} s voiceover window")
+    with st.expander("🎙️ Voiceover timing and captions"):
+        st.dataframe(
+            [{"line": line.text.replace("**", ""), "start": line.start, "seconds": line.seconds, "syllables": line.syllables} for line in timing.lines],
+            hide_index=True,
+        )
+        number = re.search(r"SHORT (\d+)", script)
+        name = caption_name(int(number.group(1))) if number else "script"
+        left, right = st.columns(2)
+        left.download_button("Download SRT", to_srt(timing), file_name=f"{name}.srt", mime="text/plain", key=f"{key}_srt")
+        right.download_button("Download SSML", to_ssml(timing), file_name=f"{name}.ssml", mime="application/ssml+xml", key=f"{key}_ssml")
+
+
+def save_script(url, script, facts=None):
+    """Record a finished script in the history and return it with its SHORT number filled in;
+    a repeated topic or a missing wiki URL is reported and the script is returned unchanged."""
+    if url is None:
+        st.warning("⚠️ No One Piece Wiki URL found in the research; the script was not saved to the history.")
+        return script
+    try:
+        entry = tools.record_script(url, script, facts)
+    except DuplicateTopicError as e:
+        st.warning(f"⚠️ Not saved: this topic was {e}.")
+        return script
+    st.success(f"📚 Saved as SHORT {entry.number}: {entry.topic}")
+    return entry.script
+
+
+def render_history(limit=5):
+    history = get_history()
+    entries = history.recent(limit)
+    st.sidebar.markdown("## 📚 History")
+    st.sidebar.markdown(f"- Next short: SHORT {history.next_number()}")
+    if entries:
+        st.sidebar.markdown("\n".join(f"- SHORT {entry.number}: {entry.topic}" for entry in entries))
+    else:
+        st.sidebar.caption("No scripts saved yet.")
+
+
+def render_jobs(limit=5):
+    """Recent background jobs in the sidebar, each linking to its page (``?job=<id>``)."""
+    jobs = get_jobs().recent(limit)
+    st.sidebar.markdown("## 🧵 Jobs")
+    if not jobs:
+        st.sidebar.caption("No background jobs yet.")
+        return
+    st.sidebar.markdown("\n".join(
+        f"- [{job.id[:8]}](?job={job.id}) {job.status}{f' ({job.stage})' if job.stage else ''}: {job.request or 'any topic'}"
+        for job in jobs
+    ))
+
+
+def render_budgets(session):
+    """What is left of this session's per-key budgets, and how many sessions are waiting on them."""
+    st.sidebar.markdown("## 🚦 API Budgets")
+    lines = []
+    for provider, api_key in (("openai", session.openai_api_key), (session.search_provider, session.search_api_key)):
+        stats = scheduler.get_scheduler().queue(provider, api_key).stats()
+        if stats["rpm"]:
+            budget = f"{stats['rpm']} requests/min ({stats['requests_left']} available now)"
+            if stats["tpm"]:
+                budget += f", {stats['tpm']:,} tokens/min ({stats['tokens_left']:,} available)"
+            lines.append(f"- {provider} (key {scheduler.key_id(api_key)[:6]}): {budget} · {stats['waiting_sessions']} session(s) waiting")
+        else:
+            lines.append(f"- {provider}: unlimited")
+    st.sidebar.markdown("\n".join(lines))
+
+
+def render_job_result(job):
+    """Outcome of a finished or interrupted job; returns the script, or "" if there is none."""
+    result = job.result or {}
+    if job.status == "ok":
+        st.success(f"📚 Saved as SHORT {result.get('number')} (job {job.id[:8]})")
+    elif job.status == "duplicate":
+        st.warning(f"⚠️ Not saved: this topic was {job.error}.")
+    elif job.status == "interrupted":
+        st.warning(f"⚠️ Job {job.id[:8]} was interrupted after {', '.join(job.completed_stages) or 'no stages'}.")
+    else:
+        st.error(f"An error occurred (job {job.id[:8]}, trace {(job.trace_id or '')[:8]}): {job.error}")
+    script = result.get("script", "")
+    if script:
+        st.markdown("## Your One Piece YouTube Short Script:")
+        st.markdown("---")
+        st.write(script)
+        render_trimmed((result.get("voiceover") or {}).get("trimmed"))
+    if result.get("draft_scores"):
+        with st.expander(f"🏆 Draft ranking ({len(result['draft_scores'])} drafts, best first)"):
+            st.dataframe(result["draft_scores"], hide_index=True)
+    return script
+
+
+def render_recent_runs(limit=10):
+    """Per-run totals (latency, tokens, cost, fetches) read back from the trace log."""
+    with st.expander("📈 Recent runs"):
+        count = st.slider("Runs to show", 1, 50, limit)
+        runs = tracing.summarize_runs(count)
+        if not runs:
+            st.caption("No traced runs yet.")
+            return
+        st.markdown(
+            f"- Total estimated cost: ${sum(run['cost_usd'] for run in runs):.4f}\n"
+            f"- Median latency: {statistics.median(run['seconds'] for run in runs):.1f} s"
+        )
+        st.dataframe(runs, hide_index=True)
+        stage_models = tracing.summarize_stage_models(count)
+        if stage_models:
+            st.markdown("**Per stage and model** (`ONEPIECE_MODEL_ROUTES` sets the routes)")
+            st.dataframe(stage_models, hide_index=True)
+        st.caption(f"Spans are appended as OpenTelemetry JSON lines to `{tracing.traces_path()}`.")
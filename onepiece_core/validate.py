@@ -0,0 +1,180 @@
+import re
+from dataclasses import asdict, dataclass, field
+
+
+MAX_SENTENCE_WORDS = 9
+MIN_WORDS = 80
+MAX_WORDS = 120
+HEADER = re.compile(r"^\*\*SHORT (?:\d+|\[?#\]?): .+\*\*$")
+LABEL = re.compile(r"^\W*(HOOK|FACTS?|CONTRADICTION|TWIST|REVEAL|ENDING|CLIFFHANGER|INTRO|OUTRO|CTA)\s*\**\s*:", re.IGNORECASE)
+BOLD = re.compile(r"\*\*(.+?)\*\*")
+# A sentence ends at . ! ? or an ellipsis followed by a capital (or bold/quoted) start; "...making"
+# continues the same sentence.
+SENTENCE_BREAK = re.compile(r"(?<=[.!?…])[\"'’”]?\s+(?=[\"'“*]*[A-Z0-9])")
+WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9'’.-]*")
+NAME_PARTICLES = {"no", "d.", "de", "du", "of", "the", "von", "van", "al", "and"}
+# A period after these does not end the sentence: "**Dr. Vegapunk**", "**Mr. 3**", and any single
+# capital initial, as in "**Monkey D. Luffy**".
+TITLES = {"mr.", "mrs.", "ms.", "dr.", "st.", "jr.", "sr.", "vs."} | {particle for particle in NAME_PARTICLES if particle.endswith(".")}
+INITIAL = re.compile(r"^[A-Z]\.$")
+SEPARATOR = re.compile(r"^-{3,}$")
+
+RULES = [
+    f"Each sentence under {MAX_SENTENCE_WORDS + 1} words.",
+    f"{MIN_WORDS}-{MAX_WORDS} words in total (the header does not count).",
+    "One sentence per line, with a blank line between lines.",
+    "Bold (**...**) only on character and proper names.",
+    "No labels like 'HOOK:' or 'FACTS:'.",
+    "First line is the header **SHORT [#]: [CATCHY TITLE]**.",
+]
+
+
+@dataclass
+class Violation:
+    rule: str
+    line: int
+    text: str
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    violations: list = field(default_factory=list)
+    word_count: int = 0
+
+    @property
+    def ok(self):
+        return not self.violations
+
+    def offending_lines(self):
+        return sorted({violation.line for violation in self.violations})
+
+    def to_dicts(self):
+        return [asdict(violation) for violation in self.violations]
+
+
+def words(text):
+    return WORD.findall(text.replace("**", ""))
+
+
+def _ends_with_abbreviation(text):
+    last = text.split()[-1].lstrip("*\"'“(") if text.split() else ""
+    return last.lower() in TITLES or bool(INITIAL.match(last))
+
+
+def sentences(line):
+    parts = []
+    for part in SENTENCE_BREAK.split(line.strip()):
+        if not part.strip():
+            continue
+        if parts and _ends_with_abbreviation(parts[-1]):
+            parts[-1] += " " + part
+        else:
+            parts.append(part)
+    return parts
+
+
+def _is_name(span):
+    tokens = span.replace("’", "'").split()
+    if not tokens or len(tokens) > 5 or not tokens[0][0].isupper():
+        return False
+    for token in tokens:
+        token = re.sub(r"'s$", "", token.strip(".,!?;:\"()"))
+        if token and not token[0].isupper() and token.lower() not in NAME_PARTICLES:
+            return False
+    return True
+
+
+def body_lines(script):
+    """``(line number, text)`` for every non-empty line except the header and ``---`` separators."""
+    lines = []
+    for number, line in enumerate(script.splitlines(), 1):
+        stripped = line.strip()
+        if stripped and not HEADER.match(stripped) and not SEPARATOR.match(stripped):
+            lines.append((number, stripped))
+    return lines
+
+
+def validate_script(script, min_words=MIN_WORDS, max_words=MAX_WORDS, max_sentence_words=MAX_SENTENCE_WORDS):
+    """Check the mechanical format rules and return every violation with its 1-based line number
+    (0 for rules about the whole script)."""
+    report = ValidationReport()
+    lines = script.strip().splitlines()
+    first = next((line.strip() for line in lines if line.strip()), "")
+    if not HEADER.match(first):
+        report.violations.append(Violation("header", 0, first, "first line must be **SHORT [#]: [CATCHY TITLE]**"))
+
+    body = body_lines(script)
+    for number, line in body:
+        if LABEL.match(line):
+            report.violations.append(Violation("label", number, line, "remove the section label"))
+        parts = sentences(line)
+        if len(parts) > 1:
+            report.violations.append(Violation("line_break", number, line, f"{len(parts)} sentences on one line; put each on its own line"))
+        for sentence in parts:
+            count = len(words(sentence))
+            if count > max_sentence_words:
+                report.violations.append(
+                    Violation("sentence_length", number, line, f"sentence has {count} words (max {max_sentence_words}): {sentence}")
+                )
+        for span in BOLD.findall(line):
+            if not _is_name(span):
+                report.violations.append(Violation("bold", number, line, f"**{span}** is not a name; remove the bold"))
+
+    report.word_count = sum(len(words(line)) for _, line in body)
+    if not min_words <= report.word_count <= max_words:
+        report.violations.append(
+            Violation("word_count", 0, "", f"script has {report.word_count} words (target {min_words}-{max_words})")
+        )
+    return report
+
+
+def repair_prompt(script, report):
+    """Prompt asking a model to rewrite only the offending lines. A word-count violation concerns
+    the whole script, so every body line is sent in that case."""
+    numbered = dict(body_lines(script))
+    if any(violation.rule == "word_count" for violation in report.violations):
+        targets = sorted(numbered)
+    else:
+        targets = [number for number in report.offending_lines() if number in numbered]
+    problems = {}
+    for violation in report.violations:
+        problems.setdefault(violation.line, []).append(violation.message)
+    lines = ["Rules:", *(f"- {rule}" for rule in RULES), "", "Problems:"]
+    lines += [f"- {message}" for message in problems.get(0, [])]
+    lines += [f"- line {number}: {message}" for number in targets for message in problems.get(number, [])]
+    lines += ["", "Lines:"]
+    lines += [f"{number}: {numbered[number]}" for number in targets]
+    if any(violation.rule == "grounding" for violation in report.violations):
+        facts = "Keep the facts, except those flagged as not on the wiki page: use what the page says instead, or drop them."
+    else:
+        facts = "Keep the facts."
+    lines += [
+        "",
+        "Return only the fixed lines as `<number>: <text>`. Repeat a number to split a line into several lines, "
+        f"use `<number>:` with no text to delete it, and use `0: <header>` to add a missing header. {facts}",
+    ]
+    return "\n".join(lines)
+
+
+def apply_repairs(script, repairs):
+    """Merge ``<number>: <text>`` replacement lines into the script; other lines are kept as is.
+    Lines are numbered over the unstripped script, as in ``body_lines`` and ``repair_prompt``."""
+    replacements = {}
+    for line in repairs.splitlines():
+        match = re.match(r"^\s*(\d+):\s?(.*)$", line)
+        if match:
+            replacements.setdefault(int(match.group(1)), []).append(match.group(2).strip())
+    if not replacements:
+        return script
+    output = []
+    if replacements.get(0):
+        output.append("\n\n".join(text for text in replacements[0] if text))
+    for number, line in enumerate(script.splitlines(), 1):
+        if number in replacements:
+            new = [text for text in replacements[number] if text]
+            if new:
+                output.append("\n\n".join(new))
+        elif line.strip():
+            output.append(line.strip())
+    return "\n\n".join(output)
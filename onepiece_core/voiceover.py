@@ -0,0 +1,211 @@
+import os
+import re
+from dataclasses import dataclass, field
+from xml.sax.saxutils import escape
+
+from onepiece_core.validate import BOLD, MIN_WORDS, body_lines, sentences, words
+
+
+MIN_SECONDS = 30
+MAX_SECONDS = 60
+# Shorts narration runs fast; 4 syllables a second is about 160 words a minute of everyday English.
+SYLLABLES_PER_SECOND = 4.0
+# Silence the narrator leaves, in seconds.
+PAUSES = {"line": 0.4, "sentence": 0.3, "ellipsis": 0.6, "comma": 0.15}
+SPOKEN_TOKEN = re.compile(r"\d[\d,]*(?:\.\d+)?|[A-Za-z][A-Za-z'’]*")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+ELLIPSIS = re.compile(r"\.\.\.|…")
+UNITS = {"cm": "centimeters", "km": "kilometers", "m": "meters", "ft": "feet", "kg": "kilograms"}
+ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven",
+    "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+SCALES = [(10 ** 9, "billion"), (10 ** 6, "million"), (1000, "thousand"), (100, "hundred")]
+
+
+def number_words(n):
+    """``n`` as it is read out: 3000000000 -> ["three", "billion"]."""
+    if n < 20:
+        return [ONES[n]]
+    if n < 100:
+        return [TENS[n // 10]] + ([ONES[n % 10]] if n % 10 else [])
+    for value, name in SCALES:
+        if n >= value:
+            return number_words(n // value) + [name] + (number_words(n % value) if n % value else [])
+
+
+def spoken_words(text):
+    """The words a narrator says for ``text``: numbers and units spelled out, markdown dropped."""
+    spoken = []
+    for token in SPOKEN_TOKEN.findall(text.replace("**", "")):
+        if token[0].isdigit():
+            whole, _, decimals = token.replace(",", "").partition(".")
+            spoken += number_words(int(whole))
+            if decimals:
+                spoken += ["point"] + [ONES[int(digit)] for digit in decimals]
+        else:
+            spoken.append(UNITS.get(token, token))
+    return spoken
+
+
+def syllables(word):
+    """Vowel-group estimate; short all-caps words (``CP9``-style acronyms) are spelled letter by letter."""
+    if word.isupper() and 1 < len(word) <= 4:
+        return sum(3 if letter == "W" else 1 for letter in word)
+    word = word.lower().strip("'’")
+    count = len(VOWEL_GROUPS.findall(word))
+    if count > 1 and word.endswith("e") and not word.endswith(("le", "ee", "ye")):
+        count -= 1
+    return max(1, count)
+
+
+@dataclass
+class LineTiming:
+    line: int
+    text: str
+    syllables: int
+    start: float
+    end: float
+
+    @property
+    def seconds(self):
+        return round(self.end - self.start, 2)
+
+
+@dataclass
+class VoiceoverTiming:
+    """Estimated narration of a script's body lines (the header is the video title, not read out)."""
+
+    lines: list = field(default_factory=list)
+    word_count: int = 0
+    trimmed: list = field(default_factory=list)
+
+    @property
+    def seconds(self):
+        return round(self.lines[-1].end, 1) if self.lines else 0.0
+
+    @property
+    def status(self):
+        if self.seconds < MIN_SECONDS:
+            return "short"
+        return "long" if self.seconds > MAX_SECONDS else "ok"
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def to_dict(self):
+        return {"seconds": self.seconds, "status": self.status, "trimmed": self.trimmed}
+
+
+def time_line(text, rate=SYLLABLES_PER_SECOND):
+    """``(syllables, seconds)`` for one line, pauses inside it included."""
+    count = sum(syllables(word) for word in spoken_words(text))
+    pauses = PAUSES["ellipsis"] * len(ELLIPSIS.findall(text))
+    pauses += PAUSES["sentence"] * (len(sentences(text)) - 1)
+    pauses += PAUSES["comma"] * text.count(",")
+    return count, count / rate + pauses
+
+
+def time_script(script, rate=SYLLABLES_PER_SECOND):
+    """Start and end of every line read at ``rate`` syllables a second, with a pause at each line break."""
+    timing = VoiceoverTiming()
+    clock = 0.0
+    for number, text in body_lines(script):
+        if timing.lines:
+            clock += PAUSES["line"]
+        count, seconds = time_line(text, rate)
+        timing.lines.append(LineTiming(number, text, count, round(clock, 2), round(clock + seconds, 2)))
+        clock += seconds
+        timing.word_count += len(words(text))
+    return timing
+
+
+def _concrete(text):
+    return bool(re.search(r"\d", text)) or bool(BOLD.search(text))
+
+
+def drop_lines(script, numbers):
+    kept = [line for number, line in enumerate(script.splitlines(), 1) if number not in numbers]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip() + "\n"
+
+
+def fit_script(script, max_seconds=MAX_SECONDS, rate=SYLLABLES_PER_SECOND):
+    """Trim a script that reads longer than ``max_seconds`` by dropping whole lines, with no LLM
+    call. The hook (first line) and the last two lines stay. Middle lines with no number or bold
+    name go first, longest first, so as few lines as possible are cut. A line is only dropped while
+    the script keeps ``MIN_WORDS`` words, so trimming never breaks the format rules; a script that is
+    still too long, or too short, is left for ``status`` to flag. Returns ``(script, timing)``."""
+    timing = time_script(script, rate)
+    if timing.seconds <= max_seconds:
+        return script, timing
+    lines = body_lines(script)
+    dropped = {}
+    word_count = timing.word_count
+    for number, text in sorted(lines[1:-2], key=lambda item: (_concrete(item[1]), -time_line(item[1], rate)[1], -item[0])):
+        count = len(words(text))
+        if word_count - count < MIN_WORDS:
+            continue
+        dropped[number] = text
+        word_count -= count
+        timing = time_script(drop_lines(script, dropped), rate)
+        if timing.seconds <= max_seconds:
+            break
+    if not dropped:
+        return script, timing
+    timing.trimmed = [dropped[number] for number in sorted(dropped)]
+    return drop_lines(script, dropped), timing
+
+
+def voiceover_stage(state):
+    """Pipeline stage after the editor: fit the script into the voiceover window and record its timing."""
+    script, timing = fit_script(state["script"])
+    return {"script": script, "voiceover": timing.to_dict()}
+
+
+def _timestamp(seconds):
+    millis = int(round(seconds * 1000))
+    return f"{millis // 3_600_000:02}:{millis // 60_000 % 60:02}:{millis // 1000 % 60:02},{millis % 1000:03}"
+
+
+def to_srt(timing):
+    """One caption per script line, shown while it is read."""
+    return "\n".join(
+        f"{index}\n{_timestamp(line.start)} --> {_timestamp(line.end)}\n{line.text.replace('**', '')}\n"
+        for index, line in enumerate(timing.lines, 1)
+    )
+
+
+def _ssml_line(text):
+    # Bold names get emphasis, ellipses become real pauses; everything else is escaped text.
+    parts = []
+    for index, part in enumerate(BOLD.split(text)):
+        part = escape(part)
+        parts.append(f'<emphasis level="moderate">{part}</emphasis>' if index % 2 else part)
+    return ELLIPSIS.sub(f'<break time="{int(PAUSES["ellipsis"] * 1000)}ms"/>', "".join(parts))
+
+
+def to_ssml(timing):
+    """SSML for a TTS engine: one ``<s>`` per line with the estimator's line-break pause between them."""
+    pause = f'<break time="{int(PAUSES["line"] * 1000)}ms"/>'
+    body = f"\n  {pause}\n  ".join(f"<s>{_ssml_line(line.text)}</s>" for line in timing.lines)
+    return f"<speak>\n  {body}\n</speak>\n"
+
+
+def caption_name(number=None, topic=""):
+    """File name for a script's captions: ``short_007``, or the topic for an unnumbered script."""
+    if number is not None:
+        return f"short_{number:03d}"
+    return re.sub(r"[^a-z0-9]+", "_", topic.lower()).strip("_") or "script"
+
+
+def write_captions(out_dir, name, script, fit=True):
+    """Write ``<name>.srt`` and ``<name>.ssml`` for ``script`` into ``out_dir`` and return its timing;
+    with ``fit`` a long script is trimmed first."""
+    os.makedirs(out_dir, exist_ok=True)
+    timing = fit_script(script)[1] if fit else time_script(script)
+    for extension, render in (("srt", to_srt), ("ssml", to_ssml)):
+        with open(os.path.join(out_dir, f"{name}.{extension}"), "w", encoding="utf-8") as f:
+            f.write(render(timing))
+    return timing
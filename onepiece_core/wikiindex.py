@@ -0,0 +1,304 @@
+import bisect
+import math
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import quote, unquote
+
+from onepiece_core.cache import cache_dir
+from onepiece_core.extract import INFOBOX_FIELDS, extract_fact_sheet
+
+
+WIKI_BASE = "https://onepiece.fandom.com/wiki/"
+CHARACTER_TEMPLATE = re.compile(r"\{\{\s*Char[ _]Box", re.IGNORECASE)
+CHARACTER_FIELDS = ("Status", "Affiliations", "Occupations", "Age", "Height", "Debut")
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or she that the their "
+    "they this to was were which who with site onepiece fandom com wiki".split()
+)
+HEIGHT = re.compile(r"(\d+(?:[.,]\d+)?)\s*(cm|m)\b")
+TITLE_WEIGHT = 3
+SNIPPET_CHARS = 200
+BM25_K1 = 1.2
+BM25_B = 0.75
+AVERAGE_HEIGHT_CM = 175
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    height_cm REAL,
+    devil_fruit TEXT,
+    fruit_type TEXT,
+    inlinks INTEGER NOT NULL,
+    surprise REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+def index_path():
+    return os.environ.get("ONEPIECE_WIKI_INDEX") or os.path.join(cache_dir(), "wiki_index.sqlite")
+
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def wiki_url(title):
+    return WIKI_BASE + quote(title.replace(" ", "_"), safe="_()'!,:/-")
+
+
+def parse_height_cm(value):
+    match = HEIGHT.search(value or "")
+    if match is None:
+        return None
+    number = float(match.group(1).replace(",", "."))
+    return number * 100 if match.group(2) == "m" else number
+
+
+@dataclass
+class WikiPage:
+    title: str
+    text: str
+    infobox: dict = field(default_factory=dict)
+    links: set = field(default_factory=set)
+
+
+# --- MediaWiki XML dump ---------------------------------------------------------------------
+
+def _strip_templates(text):
+    # Templates nest ({{Nihongo|...{{ruby}}...}}), so strip innermost first until none are left.
+    previous = None
+    while previous != text:
+        previous = text
+        text = re.sub(r"\{\{[^{}]*\}\}", "", text)
+    return text
+
+
+def _wikitext_to_text(wikitext):
+    text = re.sub(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", "", wikitext, flags=re.DOTALL)
+    text = _strip_templates(text)
+    text = re.sub(r"\{\|.*?\|\}", "", text, flags=re.DOTALL)
+    text = re.sub(r"\[\[(?:File|Image|Category):[^\]]*\]\]", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]", r"\1", text)
+    text = re.sub(r"\[https?://\S+\s*([^\]]*)\]", r"\1", text)
+    text = re.sub(r"<[^>]+>|'{2,}|^=+\s*|\s*=+$", "", text, flags=re.MULTILINE)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _char_box(wikitext):
+    match = CHARACTER_TEMPLATE.search(wikitext)
+    if match is None:
+        return None
+    labels = {source: label for source, label, _ in INFOBOX_FIELDS}
+    infobox = {}
+    for line in wikitext[match.end():].splitlines():
+        if line.startswith("}}"):
+            break
+        key, sep, value = line.lstrip("| ").partition("=")
+        key = key.strip().lower()
+        if sep and key in labels:
+            value = _wikitext_to_text(value).strip()
+            if value:
+                infobox[labels[key]] = value
+    return infobox
+
+
+def iter_xml_dump(path):
+    """Yield character pages (main namespace, ``Char Box`` infobox, not redirects) from a dump."""
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag.rsplit("}", 1)[-1] != "page":
+            continue
+        values = {child.tag.rsplit("}", 1)[-1]: child for child in element}
+        revision = values.get("revision")
+        text_node = None
+        if revision is not None:
+            text_node = next((child for child in revision if child.tag.rsplit("}", 1)[-1] == "text"), None)
+        wikitext = text_node.text if text_node is not None and text_node.text else ""
+        namespace = values["ns"].text if "ns" in values else "0"
+        if namespace == "0" and "redirect" not in values:
+            infobox = _char_box(wikitext)
+            if infobox is not None:
+                links = {link.strip().replace("_", " ") for link in re.findall(r"\[\[([^|\]#]+)", wikitext)}
+                yield WikiPage(values["title"].text, _wikitext_to_text(wikitext), infobox, links)
+        element.clear()
+
+
+# --- crawl snapshot (saved HTML pages) ------------------------------------------------------
+
+def iter_html_snapshot(directory):
+    from bs4 import BeautifulSoup
+
+    for folder, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.endswith((".html", ".htm")):
+                continue
+            with open(os.path.join(folder, name), encoding="utf-8", errors="ignore") as f:
+                html = f.read()
+            soup = BeautifulSoup(html, "lxml")
+            heading = soup.select_one("h1.page-header__title") or soup.title
+            title = heading.get_text(" ", strip=True).split(" | ")[0] if heading else os.path.splitext(name)[0]
+            sheet = extract_fact_sheet(html, wiki_url(title))
+            if not any(label in sheet.infobox for label in CHARACTER_FIELDS):
+                continue
+            root = soup.select_one(".mw-parser-output") or soup
+            links = {
+                unquote(a["href"].split("/wiki/", 1)[1].split("#")[0]).replace("_", " ")
+                for a in root.select('a[href*="/wiki/"]')
+            }
+            for tag in root(["script", "style", "aside", "table", "nav"]) + root.select("sup.reference, .mw-editsection, .toc, .navbox"):
+                tag.decompose()
+            blocks = (" ".join(tag.get_text().split()) for tag in root.find_all(["p", "li", "h2", "h3"]))
+            text = "\n".join(block for block in blocks if block)
+            yield WikiPage(title, text, sheet.infobox, links)
+
+
+def iter_pages(source):
+    return iter_html_snapshot(source) if os.path.isdir(source) else iter_xml_dump(source)
+
+
+# --- building ---------------------------------------------------------------------------------
+
+def _surprise(pages, heights, inlinks):
+    """Score how "hookable" each page is from 0 to 1: an extreme height (far from human size in
+    either direction), a devil fruit of a rare type, and low popularity (few inbound links)."""
+    fruit_types = Counter(page.infobox.get("Devil Fruit Type", "").split(" (")[0] for page in pages if page.infobox.get("Devil Fruit"))
+    fruit_total = sum(fruit_types.values()) or 1
+    ranked = sorted(inlinks)
+    scores = []
+    for page, height, links in zip(pages, heights, inlinks):
+        height_score = min(1.0, abs(math.log10(height / AVERAGE_HEIGHT_CM)) / math.log10(20)) if height else 0.0
+        fruit_score = 0.0
+        if page.infobox.get("Devil Fruit"):
+            fruit_type = page.infobox.get("Devil Fruit Type", "").split(" (")[0]
+            fruit_score = 0.4 + 0.6 * (1 - fruit_types[fruit_type] / fruit_total)
+        # Share of pages with more inbound links than this one: 1.0 for the least-linked pages.
+        obscurity = 1 - bisect.bisect_left(ranked, links) / max(len(ranked) - 1, 1)
+        scores.append(round(0.4 * height_score + 0.3 * fruit_score + 0.3 * obscurity, 4))
+    return scores
+
+
+def build_index(source, path=None):
+    """Index every character page in ``source`` (an XML dump file or a directory of saved HTML
+    pages) into a fresh SQLite file and return the number of pages indexed."""
+    pages = list(iter_pages(source))
+    titles = {page.title for page in pages}
+    inbound = Counter(link for page in pages for link in page.links & titles if link != page.title)
+    inlinks = [inbound[page.title] for page in pages]
+    heights = [parse_height_cm(page.infobox.get("Height")) for page in pages]
+    surprise = _surprise(pages, heights, inlinks)
+
+    path = path or index_path()
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        for doc_id, page in enumerate(pages):
+            terms = Counter(tokenize(page.text) + tokenize(page.title) * TITLE_WEIGHT)
+            lead = next((line for line in page.text.splitlines() if len(line) > 40), page.text)
+            conn.execute(
+                "INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    doc_id, page.title, wiki_url(page.title), lead[:SNIPPET_CHARS], sum(terms.values()),
+                    heights[doc_id], page.infobox.get("Devil Fruit"), page.infobox.get("Devil Fruit Type"),
+                    inlinks[doc_id], surprise[doc_id],
+                ),
+            )
+            conn.executemany("INSERT INTO postings VALUES (?, ?, ?)", ((term, doc_id, tf) for term, tf in terms.items()))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return len(pages)
+
+
+# --- querying ---------------------------------------------------------------------------------
+
+class WikiIndex:
+    """BM25 search over the indexed character pages.
+
+    Document metadata is loaded into memory once; postings stay in SQLite and are read per query
+    term through the primary key, so a lookup costs a few index seeks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        conn = sqlite3.connect(path)
+        try:
+            columns = ("title", "url", "snippet", "length", "height_cm", "devil_fruit", "fruit_type", "inlinks", "surprise")
+            self.docs = {
+                row[0]: dict(zip(columns, row[1:]))
+                for row in conn.execute(f"SELECT id, {', '.join(columns)} FROM docs")
+            }
+        finally:
+            conn.close()
+        self.average_length = sum(doc["length"] for doc in self.docs.values()) / max(len(self.docs), 1)
+        self._local = threading.local()
+
+    def _conn(self):
+        if not hasattr(self._local, "conn"):
+            self._local.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return self._local.conn
+
+    def search(self, query, num_results=10):
+        terms = set(tokenize(query))
+        if not terms:
+            # No topic given: surface the most surprising pages instead.
+            ranked = sorted(self.docs, key=lambda doc_id: self.docs[doc_id]["surprise"], reverse=True)
+            return [self._result(doc_id, 0.0) for doc_id in ranked[:num_results]]
+        scores = Counter()
+        total = len(self.docs)
+        for term in terms:
+            postings = self._conn().execute("SELECT doc_id, tf FROM postings WHERE term = ?", (term,)).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                length = self.docs[doc_id]["length"]
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (
+                    tf + BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length)
+                )
+        return [self._result(doc_id, score) for doc_id, score in scores.most_common(num_results)]
+
+    def _result(self, doc_id, score):
+        doc = self.docs[doc_id]
+        return {
+            "title": doc["title"],
+            "link": doc["url"],
+            "snippet": doc["snippet"],
+            "height_cm": doc["height_cm"],
+            "devil_fruit": doc["devil_fruit"],
+            "inlinks": doc["inlinks"],
+            "surprise": doc["surprise"],
+            "score": round(score, 3),
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The shared index, or None when no index has been built at ``index_path()``."""
+    global _index
+    with _index_lock:
+        path = index_path()
+        if _index is None or _index.path != path:
+            _index = WikiIndex(path) if os.path.exists(path) else None
+        return _index
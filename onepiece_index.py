@@ -0,0 +1,37 @@
+import argparse
+import json
+import sys
+import time
+
+from onepiece_core import wikiindex
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the local One Piece Wiki index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index a fandom XML dump or a directory of saved wiki pages")
+    build.add_argument("source", help="pages-current XML dump, or a crawl snapshot directory of .html files")
+    build.add_argument("--out", help=f"index file (default: {wikiindex.index_path()})")
+    search = commands.add_parser("search", help="run a query against the index")
+    search.add_argument("query", nargs="?", default="", help="leave empty to list the most surprising pages")
+    search.add_argument("-n", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        count = wikiindex.build_index(args.source, args.out)
+        print(f"indexed {count} character pages in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        return 0 if count else 1
+
+    index = wikiindex.get_index()
+    if index is None:
+        parser.error(f"no index at {wikiindex.index_path()}; run the build command first")
+    started = time.perf_counter()
+    results = index.search(args.query, args.n)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"{len(results)} results in {(time.perf_counter() - started) * 1000:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
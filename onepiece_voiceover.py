@@ -0,0 +1,50 @@
+import argparse
+import json
+import sys
+
+from onepiece_core.history import get_history
+from onepiece_core.voiceover import MAX_SECONDS, MIN_SECONDS, caption_name, write_captions
+
+
+def batch_scripts(path):
+    """``(name, script)`` for every saved script in a batch results file; a topic retried after an
+    error keeps its last successful record."""
+    scripts = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok" and record.get("script"):
+                scripts[record["topic"]] = (caption_name(record.get("number"), record["topic"]), record["script"])
+    return list(scripts.values())
+
+
+def history_scripts(limit):
+    return [(caption_name(entry.number), entry.script) for entry in reversed(get_history().recent(limit))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time scripts as a voiceover and export SRT and SSML files for them.")
+    parser.add_argument("results", nargs="?", help="batch results JSONL (default: the saved script history)")
+    parser.add_argument("--out", default="voiceover", help="directory for the .srt and .ssml files")
+    parser.add_argument("--limit", type=int, default=1000, help="without a results file, how many recent saved scripts to export")
+    parser.add_argument("--no-trim", action="store_true", help=f"only flag scripts over {MAX_SECONDS}s instead of trimming lines")
+    args = parser.parse_args(argv)
+
+    scripts = batch_scripts(args.results) if args.results else history_scripts(args.limit)
+    flagged = 0
+    for name, script in scripts:
+        timing = write_captions(args.out, name, script, fit=not args.no_trim)
+        flagged += not timing.ok
+        note = f" trimmed {len(timing.trimmed)} line(s)" if timing.trimmed else ""
+        if not timing.ok:
+            note += f" outside {MIN_SECONDS}-{MAX_SECONDS}s"
+        print(f"{name:<24} {timing.seconds:>6.1f}s  {timing.status:<5}{note}")
+    print(f"{len(scripts)} scripts exported to {args.out}/, {flagged} outside the voiceover window", file=sys.stderr)
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import pytest
+
+from onepiece_core import cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # Every test gets its own cache directory (content cache, history, traces, wiki index).
+    monkeypatch.setenv("ONEPIECE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("ONEPIECE_HISTORY_DB", raising=False)
+    monkeypatch.delenv("ONEPIECE_TRACE_FILE", raising=False)
+    monkeypatch.delenv("ONEPIECE_WIKI_INDEX", raising=False)
+    monkeypatch.setattr(cache, "_default_cache", None)
+    return tmp_path
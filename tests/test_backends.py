@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from onepiece_core.backends import build_stage_fns
+from onepiece_core.cache import get_cache
+from onepiece_core.routing import ModelRouter
+from onepiece_core.validate import validate_script
+
+
+URL = "https://onepiece.fandom.com/wiki/Sanjuan_Wolf"
+PAGE = "<html><body><div class='mw-parser-output'><p>Sanjuan Wolf is a giant.</p></div></body></html>"
+LINES = [
+    "Sanjuan Wolf is the tallest pirate ever seen.",
+    "He ate a fruit that made him grow.",
+    "Now he stands far above every other giant.",
+    "Even Oars would only reach up to his knees.",
+    "Blackbeard kept him locked away for many long years.",
+    "Then he joined the crew as a loyal titan.",
+    "The sea weakens him just like every fruit user.",
+    "Yet he walks the ocean floor without ever drowning.",
+    "His size keeps his head far above the waves.",
+    "So who could ever stop a man that big?",
+]
+DRAFT = "\n\n".join(["**SHORT 1: The Tallest Pirate**", *LINES[:4], "Blackbeard kept him locked away. Nobody knew why.", *LINES[5:]])
+USAGE = {"llm_calls": 1, "input_tokens": 10, "cached_tokens": 0, "output_tokens": 5}
+
+
+def fake_adapter(calls, repairs):
+    """An adapter whose agents answer from canned text; ``repairs`` are returned one per repair call."""
+
+    def run_stage_agent(stage_agents, role, model, slot=0, **inputs):
+        calls.append((role, model))
+        if role == "search":
+            return f"Try this one: {URL}", dict(USAGE)
+        if role == "write":
+            return DRAFT, dict(USAGE)
+        return repairs.pop(0), dict(USAGE)
+
+    return SimpleNamespace(run_stage_agent=run_stage_agent)
+
+
+def run(adapter, router):
+    state = {"request": "Sanjuan Wolf"}
+    for _, fn in build_stage_fns(adapter, None, router):
+        state.update(fn(state))
+    return state
+
+
+def test_flagged_draft_is_repaired_and_escalated_once():
+    get_cache().put("page", URL, PAGE)
+    calls = []
+    flagged = validate_script(DRAFT).offending_lines()[0]
+    unchanged = f"{flagged}: Blackbeard kept him locked away. Nobody knew why."
+    split = f"{flagged}: Blackbeard kept him locked away.\n{flagged}: Nobody knew why."
+    adapter = fake_adapter(calls, [unchanged, split])
+    router = ModelRouter("gpt-4.1-mini", {"search": "default", "write": "default", "edit": "gpt-4.1-nano"})
+
+    state = run(adapter, router)
+
+    assert calls == [("search", "gpt-4.1-mini"), ("write", "gpt-4.1-mini"), ("repair", "gpt-4.1-nano"), ("repair", "gpt-4.1-mini")]
+    assert state["url"] == URL
+    assert validate_script(state["script"]).ok
+    assert state["violations"] == []
+    assert [violation["rule"] for violation in state["draft_violations"]] == ["line_break"]
+    assert state["usage"]["escalated_to"] == "gpt-4.1-mini"
+    assert state["voiceover"]["status"] in ("ok", "short")
@@ -0,0 +1,21 @@
+from onepiece_core.grounding import PageIndex
+
+
+PAGE = "\n".join([
+    "Sanjuan Wolf",
+    "Sanjuan Wolf",
+    "Abilities and Powers",
+    "Sanjuan Wolf ate the Deka Deka no Mi, which made him the largest giant.",
+    "Height: 180 m",
+])
+
+
+def test_evidence_skips_the_title_and_prefers_body_sentences():
+    index = PageIndex.build(PAGE)
+    assert index.evidence("**Sanjuan Wolf** is huge.").startswith("Sanjuan Wolf ate the Deka Deka no Mi")
+    assert index.evidence("**Wolf** has powers.").startswith("Sanjuan Wolf ate the Deka Deka no Mi")
+
+
+def test_evidence_for_a_length_is_the_line_with_the_length():
+    index = PageIndex.build(PAGE)
+    assert index.evidence("**Sanjuan Wolf** is 300 meters tall.") == "Height: 180 m"
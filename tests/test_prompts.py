@@ -0,0 +1,10 @@
+from onepiece_core.prompts import STYLE_EXAMPLES
+from onepiece_core.validate import validate_script
+
+
+def test_style_examples_pass_the_format_rules():
+    examples = "\n".join(STYLE_EXAMPLES).split("\n---\n")
+    assert len(examples) == 3
+    for example in examples:
+        report = validate_script(example)
+        assert report.ok, [violation.message for violation in report.violations]
@@ -0,0 +1,32 @@
+import requests
+
+from onepiece_core import tools, tracing
+
+
+class FailingTransport:
+    """Answers every request the way SerpApi answers a bad key, once the retries are used up."""
+
+    def get(self, url, params=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 401
+        response.reason = "Unauthorized"
+        response.url = requests.Request("GET", url, params=params).prepare().url
+        return response
+
+
+def test_failed_search_does_not_leak_the_key(isolated_cache, monkeypatch):
+    monkeypatch.setattr(tools, "get_transport", FailingTransport)
+    key = "serpapi-secret-123"
+
+    result = tools.wiki_search("Sanjuan Wolf", 5, lambda q, n: tools.serpapi_search(q, key, n))
+
+    assert result.startswith("TOOL ERROR: HTTPError: 401 Unauthorized from serpapi.com")
+    assert key not in result
+    traces = (isolated_cache / "traces.jsonl").read_text(encoding="utf-8")
+    assert "401 Unauthorized from serpapi.com" in traces
+    assert key not in traces
+
+
+def test_redact_drops_query_strings_and_keys():
+    message = "Max retries exceeded with url: /search.json?q=x&api_key=abc (https://serpapi.com/search.json?api_key=abc)"
+    assert "abc" not in tracing.redact(message)
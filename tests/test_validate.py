@@ -0,0 +1,36 @@
+from onepiece_core.grounding import check_script
+from onepiece_core.validate import apply_repairs, body_lines, repair_prompt, validate_script
+
+
+BODY = [
+    "Sanjuan Wolf is the tallest pirate ever seen.",
+    "He ate a fruit that made him grow.",
+    "Now he stands far above every other giant.",
+    "Even Oars would only reach up to his knees.",
+    "Blackbeard kept him locked away for many long years.",
+    "Then he joined the crew as a loyal titan.",
+    "The sea weakens him just like every fruit user.",
+    "Yet he walks the ocean floor without ever drowning.",
+    "His size keeps his head far above the waves.",
+    "So who could ever stop a man that big?",
+]
+
+
+def script_with(line_five, leading="\n"):
+    lines = ["**SHORT 1: The Tallest Pirate**", *BODY[:4], line_five, *BODY[5:]]
+    return leading + "\n\n".join(lines) + "\n"
+
+
+def test_repairs_land_on_the_flagged_line_after_a_leading_blank_line():
+    script = script_with("Blackbeard kept him locked away. Nobody knew why.")
+    report = check_script(script)
+    assert [violation.rule for violation in report.violations] == ["line_break"]
+    flagged = report.offending_lines()[0]
+    assert f"{flagged}: Blackbeard kept him locked away. Nobody knew why." in repair_prompt(script, report)
+
+    # What a model returns for that prompt: the flagged line split in two.
+    repaired = apply_repairs(script, f"{flagged}: Blackbeard kept him locked away.\n{flagged}: Nobody knew why.")
+
+    assert validate_script(repaired).ok
+    texts = [text for _, text in body_lines(repaired)]
+    assert texts == [*BODY[:4], "Blackbeard kept him locked away.", "Nobody knew why.", *BODY[5:]]